@@ -1,5 +1,7 @@
 from django.contrib import admin
-from .models import Category, Location, Post, Comment
+from .models import Category, Comment, ImageJob, Location, Post
+from .search import get_search_backend
+from .signals import set_categories_published
 
 admin.site.empty_value_display = 'Не задано'
 
@@ -12,7 +14,8 @@ class PostAdmin(admin.ModelAdmin):
         'location',
         'category',
         'is_published',
-        'created_at'
+        'created_at',
+        'comment_count'
     )
     list_editable = (
         'is_published',
@@ -23,6 +26,14 @@ class PostAdmin(admin.ModelAdmin):
     list_filter = ('category', 'author', 'created_at',)
     list_display_links = ('title',)
 
+    def get_search_results(self, request, queryset, search_term):
+        """Поиск по индексу публикаций вместо LIKE по заголовку"""
+        if not search_term:
+            return queryset, False
+        return get_search_backend(queryset.db).search(
+            queryset, search_term
+        ), False
+
 
 class CategoryAdmin(admin.ModelAdmin):
     list_display = (
@@ -33,6 +44,17 @@ class CategoryAdmin(admin.ModelAdmin):
     search_fields = ('title',)
     list_filter = ('title',)
     list_display_links = ('title',)
+    actions = ('publish', 'unpublish')
+
+    @admin.action(description='Опубликовать выбранные категории')
+    def publish(self, request, queryset):
+        """Публикация категорий и их публикаций"""
+        set_categories_published(queryset, True)
+
+    @admin.action(description='Снять с публикации выбранные категории')
+    def unpublish(self, request, queryset):
+        """Снятие категорий и скрытие их публикаций"""
+        set_categories_published(queryset, False)
 
 
 class LocationAdmin(admin.ModelAdmin):
@@ -53,7 +75,16 @@ class CommentAdmin(admin.ModelAdmin):
     list_display_links = ('text',)
 
 
+class ImageJobAdmin(admin.ModelAdmin):
+    list_display = (
+        'post', 'image', 'status', 'attempts', 'created_at', 'error'
+    )
+    list_filter = ('status',)
+    raw_id_fields = ('post',)
+
+
 admin.site.register(Post, PostAdmin)
 admin.site.register(Location, LocationAdmin)
 admin.site.register(Category, CategoryAdmin)
 admin.site.register(Comment, CommentAdmin)
+admin.site.register(ImageJob, ImageJobAdmin)
@@ -0,0 +1,48 @@
+"""Кэширование пользователя, вошедшего на сайт.
+
+AuthenticationMiddleware на каждом запросе читает пользователя по id из
+сессии. CachedModelBackend берёт его из кэша USER_CACHE_ALIAS; запись
+заполняется при входе и сбрасывается при сохранении и удалении
+пользователя (см. signals), в том числе при изменении профиля и смене
+пароля. Проверку хэша пароля в сессии
+по-прежнему выполняет django.contrib.auth.get_user, поэтому после смены
+пароля другие сессии пользователя завершаются, как и без кэша.
+"""
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import caches
+from django.db import transaction
+
+USER_KEY = 'auth_user:{}'
+
+
+def user_cache():
+    return caches[settings.USER_CACHE_ALIAS]
+
+
+def cache_user(user):
+    """Сохранение пользователя в кэш"""
+    user_cache().set(
+        USER_KEY.format(user.pk), user, settings.USER_CACHE_TIMEOUT
+    )
+
+
+def invalidate_user(user_id):
+    """Удаление пользователя из кэша сейчас и после коммита"""
+    key = USER_KEY.format(user_id)
+    user_cache().delete(key)
+    # Иначе параллельный запрос может успеть закэшировать старую запись.
+    transaction.on_commit(lambda: user_cache().delete(key))
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend, читающий пользователя сессии из кэша"""
+
+    def get_user(self, user_id):
+        """Пользователь из кэша или из БД с сохранением в кэш"""
+        user = user_cache().get(USER_KEY.format(user_id))
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache_user(user)
+        return user
@@ -0,0 +1,75 @@
+"""Настройка соединений SQLite и повтор записи при блокировке БД.
+
+При открытии соединения с SQLite выполняются PRAGMA из SQLITE_PRAGMAS:
+журнал WAL позволяет читать во время записи, а busy_timeout заставляет
+писателя ждать освобождения блокировки вместо немедленной ошибки.
+Если блокировка не освободилась за busy_timeout, представления с
+RetryOnLockedMixin повторяют запрос целиком в новой транзакции.
+
+Django 3.2 не поддерживает CONN_HEALTH_CHECKS, поэтому проверку
+постоянных соединений в начале запроса выполняет check_connections.
+"""
+import random
+import time
+
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import OperationalError, connections, transaction
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+LOCKED_MESSAGES = ('database is locked', 'database table is locked')
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    """Выполнение PRAGMA из SQLITE_PRAGMAS для нового соединения SQLite"""
+    # Соединение из пула уже настроено при первом подключении.
+    if connection.vendor != 'sqlite' or getattr(
+        connection, 'connection_reused', False
+    ):
+        return
+    with connection.cursor() as cursor:
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+@receiver(request_started)
+def check_connections(sender, **kwargs):
+    """Закрытие разорванных постоянных соединений перед запросом"""
+    for connection in connections.all():
+        if (
+            connection.settings_dict.get('CONN_HEALTH_CHECKS')
+            and connection.connection is not None
+            and not connection.is_usable()
+        ):
+            connection.close()
+
+
+def is_locked(error):
+    """Вызвана ли ошибка блокировкой БД другим писателем"""
+    return any(message in str(error) for message in LOCKED_MESSAGES)
+
+
+def retry_on_locked(func, *args, **kwargs):
+    """Вызов func в транзакции с повторами при блокировке БД"""
+    attempts = settings.DB_LOCKED_RETRIES + 1
+    for attempt in range(attempts):
+        try:
+            with transaction.atomic():
+                return func(*args, **kwargs)
+        except OperationalError as error:
+            if not is_locked(error) or attempt == attempts - 1:
+                raise
+        # Экспоненциальная пауза со случайной добавкой, чтобы повторы
+        # писателей не совпадали.
+        delay = settings.DB_LOCKED_RETRY_DELAY * 2 ** attempt
+        time.sleep(delay + random.uniform(0, delay))
+
+
+class RetryOnLockedMixin:
+    """Миксин, повторяющий POST-запрос при блокировке БД"""
+
+    def post(self, request, *args, **kwargs):
+        """Обработка формы с повторами при блокировке"""
+        return retry_on_locked(super().post, request, *args, **kwargs)
@@ -0,0 +1,129 @@
+"""Фоновая обработка изображений публикаций.
+
+Задание сохраняется в таблицу ImageJob в одной транзакции с публикацией,
+а после коммита передаётся пулу потоков процесса. Задания, которые не
+успели выполниться (перезапуск процесса, IMAGE_JOBS_IN_PROCESS = False),
+остаются в БД и выполняются командой process_image_jobs.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from threading import Lock
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import ImageJob, Post
+from .renditions import generate_renditions
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 3
+
+executor = None
+executor_lock = Lock()
+
+
+def get_executor():
+    """Пул потоков процесса, создаётся при первом задании"""
+    global executor
+    with executor_lock:
+        if executor is None:
+            executor = ThreadPoolExecutor(
+                max_workers=settings.IMAGE_JOB_WORKERS,
+                thread_name_prefix='image-jobs',
+            )
+    return executor
+
+
+def enqueue_renditions(post):
+    """Постановка в очередь задания на копии изображения публикации"""
+    # Одно задание на изображение: упавшее задание не ставится заново
+    # при каждом сохранении публикации.
+    job, created = ImageJob.objects.get_or_create(
+        post=post, image=post.image.name
+    )
+    if created and settings.IMAGE_JOBS_IN_PROCESS:
+        transaction.on_commit(
+            lambda: get_executor().submit(run_in_thread, job.pk)
+        )
+    return job
+
+
+def run_in_thread(job_id):
+    """Выполнение задания в потоке пула с закрытием его соединений с БД"""
+    try:
+        run_job(job_id)
+    finally:
+        connections.close_all()
+
+
+def claim_job(job_id):
+    """Перевод задания в работу; False, если его уже взял другой обработчик"""
+    return bool(ImageJob.objects.filter(
+        pk=job_id, status=ImageJob.PENDING
+    ).update(
+        status=ImageJob.RUNNING,
+        attempts=F('attempts') + 1,
+        started_at=timezone.now(),
+    ))
+
+
+def apply_renditions(post):
+    """Создание копий и отметка о них, если изображение не сменилось"""
+    from .signals import invalidate_posts_pages
+
+    size = generate_renditions(post.image)
+    if size is None:
+        return False
+    posts = Post.objects.filter(pk=post.pk, image=post.image.name)
+    if posts.update(
+        image_meta={
+            'width': size[0], 'height': size[1], 'renditions': True
+        },
+        updated_at=timezone.now(),
+    ):
+        invalidate_posts_pages(posts)
+    return True
+
+
+def run_job(job_id):
+    """Выполнение задания; неудачное повторяется до MAX_ATTEMPTS раз"""
+    if not claim_job(job_id):
+        return
+    job = ImageJob.objects.select_related('post').get(pk=job_id)
+    try:
+        done = not job.post.image or apply_renditions(job.post)
+        job.error = '' if done else (
+            f'Не удалось открыть изображение {job.post.image.name}'
+        )
+    except Exception as error:
+        logger.exception('Задание обработки изображения %s упало', job_id)
+        done, job.error = False, repr(error)
+    if done:
+        job.status = ImageJob.DONE
+    elif job.attempts >= MAX_ATTEMPTS:
+        job.status = ImageJob.FAILED
+    else:
+        job.status = ImageJob.PENDING
+    job.save(update_fields=['status', 'error'])
+
+
+def reset_stale_jobs(older_than):
+    """Возврат в очередь заданий, прерванных остановкой процесса"""
+    return ImageJob.objects.filter(
+        status=ImageJob.RUNNING,
+        started_at__lt=timezone.now() - timedelta(seconds=older_than),
+    ).update(status=ImageJob.PENDING)
+
+
+def run_pending_jobs(limit=None):
+    """Выполнение ожидающих заданий в порядке постановки в очередь"""
+    job_ids = list(ImageJob.objects.filter(
+        status=ImageJob.PENDING
+    ).values_list('id', flat=True)[:limit])
+    for job_id in job_ids:
+        run_job(job_id)
+    return len(job_ids)
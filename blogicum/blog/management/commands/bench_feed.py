@@ -0,0 +1,50 @@
+"""Команда для замера времени ответа и размера страниц ленты."""
+import time
+from statistics import mean, median
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        'Запрашивает страницы через тестовый клиент и выводит время ответа, '
+        'число запросов к БД и размер ответа'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('urls', nargs='*', default=['/'])
+        parser.add_argument('--repeat', type=int, default=50)
+        parser.add_argument('--warmup', type=int, default=1)
+        parser.add_argument(
+            '--user',
+            help='Имя пользователя, от которого выполнять запросы; '
+                 'авторизованным страницы отдаются без кэша страниц'
+        )
+
+    def handle(self, *args, **options):
+        client = Client()
+        if options['user']:
+            client.force_login(User.objects.get(username=options['user']))
+        for url in options['urls']:
+            for _ in range(options['warmup']):
+                client.get(url)
+            timings = []
+            with CaptureQueriesContext(connection) as context:
+                for _ in range(options['repeat']):
+                    start = time.perf_counter()
+                    response = client.get(url)
+                    timings.append(time.perf_counter() - start)
+            queries = len(context.captured_queries) / options['repeat']
+            self.stdout.write(
+                f'{url}: {response.status_code}, '
+                f'среднее {mean(timings) * 1000:.1f} мс, '
+                f'медиана {median(timings) * 1000:.1f} мс, '
+                f'{len(timings) / sum(timings):.1f} запросов/с, '
+                f'{queries:.1f} запросов к БД, '
+                f'{len(response.content)} байт'
+            )
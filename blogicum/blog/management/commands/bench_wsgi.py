@@ -0,0 +1,125 @@
+"""Команда для замера пропускной способности с постоянными соединениями."""
+import io
+import sys
+import threading
+import time
+from collections import Counter
+from statistics import quantiles
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test import Client
+from django.urls import reverse
+
+from blog.models import User
+from blogicum.backends.pool import pool_stats
+
+
+class Command(BaseCommand):
+    help = (
+        'Запрашивает страницу из нескольких потоков через WSGI-обработчик, '
+        'как многопоточный воркер: соединения с БД открываются и '
+        'закрываются по CONN_MAX_AGE или берутся из пула. Выводит число '
+        'запросов в секунду и статистику пула. Профиль БД задаётся '
+        'переменными окружения (см. blogicum.database)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', help='По умолчанию — главная страница')
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument(
+            '--requests', type=int, default=200,
+            help='Запросов от каждого потока'
+        )
+        parser.add_argument(
+            '--user',
+            help='Имя пользователя, от которого выполнять запросы; '
+                 'авторизованным страницы отдаются без кэша страниц'
+        )
+
+    def environ(self, path, cookie):
+        """Окружение WSGI для GET-запроса"""
+        return {
+            'REQUEST_METHOD': 'GET',
+            'PATH_INFO': path,
+            'QUERY_STRING': '',
+            'SERVER_NAME': 'localhost',
+            'SERVER_PORT': '80',
+            'SERVER_PROTOCOL': 'HTTP/1.1',
+            'HTTP_COOKIE': cookie,
+            'wsgi.url_scheme': 'http',
+            'wsgi.input': io.BytesIO(),
+            'wsgi.errors': sys.stderr,
+        }
+
+    def session_cookie(self, username):
+        """Cookie сессии пользователя username"""
+        if not username:
+            return ''
+        client = Client()
+        client.force_login(User.objects.get(username=username))
+        name = settings.SESSION_COOKIE_NAME
+        return f'{name}={client.cookies[name].value}'
+
+    def worker(self, handler, path, cookie, count, barrier, outcomes):
+        """Последовательные запросы одного потока"""
+        barrier.wait()
+        try:
+            for _ in range(count):
+                statuses = []
+                start = time.perf_counter()
+                response = handler(
+                    self.environ(path, cookie),
+                    lambda status, headers: statuses.append(status)
+                )
+                b''.join(response)
+                # Как WSGI-сервер: close() отправляет request_finished,
+                # по которому Django закрывает или возвращает соединения.
+                response.close()
+                outcomes.append(
+                    (statuses[0][:3], time.perf_counter() - start)
+                )
+        finally:
+            connections.close_all()
+
+    def handle(self, *args, **options):
+        path = options['path'] or reverse('blog:index')
+        cookie = self.session_cookie(options['user'])
+        connections.close_all()
+        handler = WSGIHandler()
+        threads_count = options['threads']
+        barrier = threading.Barrier(threads_count + 1)
+        outcomes = []
+        threads = [
+            threading.Thread(
+                target=self.worker,
+                args=(
+                    handler, path, cookie, options['requests'], barrier,
+                    outcomes
+                )
+            )
+            for _ in range(threads_count)
+        ]
+        for thread in threads:
+            thread.start()
+        barrier.wait()
+        start = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        database = connections['default'].settings_dict
+        statuses = Counter(status for status, _ in outcomes)
+        timings = [timing for _, timing in outcomes]
+        p95 = quantiles(timings, n=20)[-1] if len(timings) > 1 else 0
+        self.stdout.write(
+            f'{database["ENGINE"]}, '
+            f'CONN_MAX_AGE={database["CONN_MAX_AGE"]}, '
+            f'потоков {threads_count}: '
+            f'ответы {dict(statuses)}, '
+            f'{len(outcomes) / elapsed:.1f} запросов/с, '
+            f'p95 {p95 * 1000:.1f} мс'
+        )
+        for alias, stats in pool_stats().items():
+            self.stdout.write(f'Пул {alias}: {stats}')
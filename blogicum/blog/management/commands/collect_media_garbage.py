@@ -0,0 +1,83 @@
+"""Команда для удаления изображений, на которые не ссылаются публикации."""
+import posixpath
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+from django.utils import timezone
+
+from blog.models import Post
+from blog.renditions import (
+    RENDITION_FORMATS, RENDITION_WIDTHS, rendition_name
+)
+
+# Свежие файлы не удаляются: публикация с ними может быть ещё не сохранена.
+GRACE_PERIOD = 3600
+
+
+def walk(storage, directory):
+    """Все файлы каталога хранилища и его подкаталогов"""
+    directories, files = storage.listdir(directory)
+    for name in files:
+        yield posixpath.join(directory, name)
+    for name in directories:
+        yield from walk(storage, posixpath.join(directory, name))
+
+
+def image_references():
+    """Число публикаций, ссылающихся на каждый файл изображения"""
+    return dict(
+        Post.objects.exclude(image='').values_list('image').annotate(
+            posts=Count('id')
+        ).order_by()
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет из хранилища изображения и их копии, на которые больше не '
+        'ссылается ни одна публикация'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Только вывести, какие файлы будут удалены'
+        )
+        parser.add_argument(
+            '--grace', type=int, default=GRACE_PERIOD,
+            help='Не удалять файлы моложе заданного числа секунд'
+        )
+
+    def handle(self, *args, **options):
+        field = Post._meta.get_field('image')
+        storage = field.storage
+        references = image_references()
+        referenced = set(references)
+        for name in references:
+            referenced.update(
+                rendition_name(name, size, extension)
+                for size in RENDITION_WIDTHS
+                for extension, *_ in RENDITION_FORMATS
+            )
+        threshold = timezone.now() - timedelta(seconds=options['grace'])
+        removed = freed = total = 0
+        if storage.exists(field.upload_to):
+            for name in walk(storage, field.upload_to):
+                total += 1
+                if (name in referenced
+                        or storage.get_modified_time(name) > threshold):
+                    continue
+                removed += 1
+                freed += storage.size(name)
+                if options['verbosity'] > 1 or options['dry_run']:
+                    self.stdout.write(name)
+                if not options['dry_run']:
+                    storage.delete(name)
+        self.stdout.write(
+            f'Файлов: {total}, изображений в публикациях: {len(references)}'
+            f' (общих для нескольких публикаций: '
+            f'{sum(posts > 1 for posts in references.values())}), '
+            f'{"к удалению" if options["dry_run"] else "удалено"}: '
+            f'{removed} ({freed} байт)'
+        )
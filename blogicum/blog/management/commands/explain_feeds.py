@@ -0,0 +1,69 @@
+"""Команда для вывода планов запросов лент публикаций."""
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import RequestFactory
+
+from blog.models import Category, Post, User
+from blog.views import PostCategoryView, PostListView, ProfileListView
+
+
+class Command(BaseCommand):
+    help = (
+        'Выводит планы запросов главной ленты, ленты категории и профиля; '
+        'с --compare дополнительно показывает планы без индексов Post. '
+        'Сравнение на время удаляет индексы, запускайте его только на '
+        'тестовой базе'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--compare', action='store_true',
+            help='Сравнить с планами без индексов из Post.Meta.indexes'
+        )
+
+    def feed_querysets(self):
+        """Запросы первой страницы каждой ленты так, как их строят view"""
+        feeds = [('index', PostListView, {})]
+        category = Category.objects.filter(is_published=True).first()
+        if category:
+            feeds.append((
+                f'category {category.slug}', PostCategoryView,
+                {'category_slug': category.slug}
+            ))
+        author = User.objects.filter(posts__isnull=False).first()
+        if author:
+            feeds.append((
+                f'profile {author.username}', ProfileListView,
+                {'username': author.username}
+            ))
+        for title, view_class, kwargs in feeds:
+            request = RequestFactory().get('/')
+            request.user = AnonymousUser()
+            view = view_class()
+            view.setup(request, **kwargs)
+            queryset = view.get_queryset()
+            yield title, queryset[:view.paginate_by]
+
+    def explain(self, header):
+        self.stdout.write(self.style.MIGRATE_HEADING(header))
+        for title, queryset in self.feed_querysets():
+            self.stdout.write(self.style.MIGRATE_LABEL(f'{title}:'))
+            self.stdout.write(queryset.explain())
+
+    def handle(self, *args, **options):
+        self.explain('С индексами')
+        if not options['compare']:
+            return
+        indexes = Post._meta.indexes
+        with connection.schema_editor() as schema_editor:
+            for index in indexes:
+                schema_editor.remove_index(Post, index)
+        try:
+            # Новое соединение, чтобы не получить планы из кэша выражений.
+            connection.close()
+            self.explain('Без индексов')
+        finally:
+            with connection.schema_editor() as schema_editor:
+                for index in indexes:
+                    schema_editor.add_index(Post, index)
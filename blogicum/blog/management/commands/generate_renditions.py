@@ -0,0 +1,32 @@
+"""Команда для создания копий изображений уже загруженных публикаций."""
+from django.core.management.base import BaseCommand
+
+from blog.jobs import apply_renditions
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = (
+        'Создаёт уменьшенные копии изображений публикаций, у которых их '
+        'ещё нет'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Пересоздать копии для всех изображений'
+        )
+
+    def handle(self, *args, **options):
+        posts = Post.objects.exclude(image='')
+        if not options['all']:
+            posts = posts.exclude(image_meta__renditions=True)
+        done = failed = 0
+        for post in posts.only('id', 'image').iterator():
+            if apply_renditions(post):
+                done += 1
+            else:
+                failed += 1
+        self.stdout.write(
+            f'Обработано изображений: {done}, с ошибкой: {failed}'
+        )
@@ -0,0 +1,41 @@
+"""Команда-обработчик очереди заданий на копии изображений."""
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.jobs import reset_stale_jobs, run_pending_jobs
+
+STALE_AFTER = 600
+
+
+class Command(BaseCommand):
+    help = (
+        'Выполняет ожидающие задания на создание копий изображений. С '
+        '--loop продолжает опрашивать очередь, пока процесс не остановят'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop', action='store_true', help='Не завершаться'
+        )
+        parser.add_argument(
+            '--interval', type=float, default=5,
+            help='Пауза между опросами очереди, секунды'
+        )
+        parser.add_argument(
+            '--stale-after', type=int, default=STALE_AFTER,
+            help='Через сколько секунд вернуть в очередь зависшее задание'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            reset = reset_stale_jobs(options['stale_after'])
+            done = run_pending_jobs()
+            if reset or done:
+                self.stdout.write(
+                    f'Возвращено в очередь: {reset}, выполнено: {done}'
+                )
+            if not options['loop']:
+                return
+            if not done:
+                time.sleep(options['interval'])
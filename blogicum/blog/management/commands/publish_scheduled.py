@@ -0,0 +1,37 @@
+"""Команда для выпуска отложенных публикаций."""
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.scheduler import next_release_time, publish_due_posts
+
+
+class Command(BaseCommand):
+    help = (
+        'Отмечает видимыми отложенные публикации, время которых наступило, '
+        'и сбрасывает кэши их лент. С --loop ждёт следующие публикации'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop', action='store_true', help='Не завершаться'
+        )
+        parser.add_argument(
+            '--interval', type=float, default=60,
+            help='Наибольшая пауза между проверками, секунды'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            published = publish_due_posts()
+            if published:
+                self.stdout.write(f'Выпущено публикаций: {published}')
+            if not options['loop']:
+                return
+            delay = options['interval']
+            release = next_release_time()
+            if release is not None:
+                # Проснуться к выходу ближайшей публикации, если он раньше.
+                delay = min(delay, (release - timezone.now()).total_seconds())
+            time.sleep(max(delay, 0.1))
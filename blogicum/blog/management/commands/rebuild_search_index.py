@@ -0,0 +1,23 @@
+"""Команда для перестроения поискового индекса публикаций."""
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from blog.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет поисковый индекс заново из таблицы публикаций; нужна '
+        'после изменения публикаций в обход Post.save()'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        backend = get_search_backend(options['database'])
+        with transaction.atomic(using=options['database']):
+            backend.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f'Индекс перестроен: {type(backend).__name__}'
+        ))
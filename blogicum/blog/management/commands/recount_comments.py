@@ -0,0 +1,54 @@
+"""Команда для пересчёта счётчиков комментариев публикаций."""
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from blog.models import Comment, Post
+from blog.signals import invalidate_posts_pages
+
+BATCH_SIZE = 500
+
+
+def actual_comment_count():
+    """Число комментариев публикации по таблице комментариев"""
+    return Coalesce(Subquery(
+        Comment.objects.filter(
+            post=OuterRef('pk')
+        ).order_by().values('post').annotate(
+            count=Count('pk')
+        ).values('count')
+    ), 0)
+
+
+class Command(BaseCommand):
+    help = (
+        'Находит публикации, у которых счётчик комментариев расходится с '
+        'таблицей комментариев, и пересчитывает его'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Только вывести число расходящихся счётчиков'
+        )
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        stale_ids = list(
+            Post.objects.annotate(
+                actual=actual_comment_count()
+            ).exclude(
+                comment_count=F('actual')
+            ).values_list('id', flat=True)
+        )
+        self.stdout.write(f'Расходящихся счётчиков: {len(stale_ids)}')
+        if options['dry_run'] or not stale_ids:
+            return
+        batch_size = options['batch_size']
+        for start in range(0, len(stale_ids), batch_size):
+            posts = Post.objects.filter(
+                id__in=stale_ids[start:start + batch_size]
+            )
+            posts.update(comment_count=actual_comment_count())
+            invalidate_posts_pages(posts)
+        self.stdout.write(self.style.SUCCESS('Счётчики пересчитаны'))
@@ -0,0 +1,77 @@
+"""Команда для наполнения базы большим количеством публикаций."""
+import random
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.models import Category, Location, Post, User
+from blog.search import get_search_backend
+
+BATCH_SIZE = 5000
+
+
+class Command(BaseCommand):
+    help = 'Создаёт заданное количество публикаций для нагрузочных замеров'
+
+    def add_arguments(self, parser):
+        parser.add_argument('posts', type=int, help='Количество публикаций')
+        parser.add_argument('--authors', type=int, default=100)
+        parser.add_argument('--categories', type=int, default=20)
+        parser.add_argument('--locations', type=int, default=20)
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        authors = [
+            User.objects.get_or_create(username=f'seed_author_{i}')[0]
+            for i in range(options['authors'])
+        ]
+        categories = [
+            Category.objects.get_or_create(
+                slug=f'seed-category-{i}',
+                defaults={
+                    'title': f'Категория {i}',
+                    'description': 'Сгенерированная категория',
+                    'is_published': i % 10 != 0,
+                }
+            )[0]
+            for i in range(options['categories'])
+        ]
+        locations = [
+            Location.objects.get_or_create(name=f'Место {i}')[0]
+            for i in range(options['locations'])
+        ]
+        now = timezone.now()
+        total = options['posts']
+        batch_size = options['batch_size']
+        for start in range(0, total, batch_size):
+            pub_dates = [
+                now - timedelta(
+                    minutes=random.randint(-60 * 24, 60 * 24 * 365 * 5)
+                )
+                for _ in range(start, min(start + batch_size, total))
+            ]
+            # bulk_create не вызывает Post.save(), is_visible задаётся явно.
+            posts = [
+                Post(
+                    title=f'Публикация {start + number}',
+                    text='Текст сгенерированной публикации ' * 10,
+                    pub_date=pub_date,
+                    is_published=random.random() > 0.05,
+                    author=random.choice(authors),
+                    category=random.choice(categories),
+                    location=random.choice(locations),
+                )
+                for number, pub_date in enumerate(pub_dates)
+            ]
+            for post in posts:
+                post.is_visible = (
+                    post.is_published
+                    and post.category.is_published
+                    and post.pub_date <= now
+                )
+            Post.objects.bulk_create(posts)
+            self.stdout.write(f'Создано {min(start + batch_size, total)}')
+        # bulk_create не отправляет сигналы, индекс поиска строится заново.
+        get_search_backend().rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Готово: {total} публикаций'))
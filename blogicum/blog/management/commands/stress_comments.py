@@ -0,0 +1,118 @@
+"""Команда для нагрузочной проверки одновременной записи комментариев."""
+import threading
+import time
+from collections import Counter
+from statistics import quantiles
+
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection, connections
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from blog.models import Comment, Post, User
+
+# Настройки SQLite по умолчанию: журнал отката, полная синхронизация
+# и ожидание блокировки 5 с (timeout модуля sqlite3), без повторов.
+DEFAULT_SQLITE = {
+    'SQLITE_PRAGMAS': {'journal_mode': 'delete', 'synchronous': 'full'},
+    'DB_LOCKED_RETRIES': 0,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Отправляет комментарии из нескольких потоков одновременно через '
+        'CommentCreateView и выводит пропускную способность и число ошибок '
+        '«database is locked». С --default-sqlite — без WAL, PRAGMA и '
+        'повторов. Комментарии пишутся в рабочую БД и затем удаляются'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--writers', type=int, default=8)
+        parser.add_argument(
+            '--comments', type=int, default=25,
+            help='Комментариев от каждого потока'
+        )
+        parser.add_argument(
+            '--default-sqlite', action='store_true',
+            help='Замер с настройками SQLite по умолчанию'
+        )
+        parser.add_argument(
+            '--keep', action='store_true', help='Не удалять комментарии'
+        )
+
+    def write_comments(self, client, url, count, barrier, outcomes):
+        """Отправка count комментариев после общего старта потоков"""
+        barrier.wait()
+        try:
+            for number in range(count):
+                start = time.perf_counter()
+                try:
+                    response = client.post(
+                        url, {'text': f'Нагрузочный комментарий {number}'}
+                    )
+                except OperationalError:
+                    outcome = 'locked'
+                else:
+                    outcome = (
+                        'created' if response.status_code == 302 else 'failed'
+                    )
+                # list.append атомарен, общий список не нужно защищать.
+                outcomes.append((outcome, time.perf_counter() - start))
+        finally:
+            connection.close()
+
+    def run(self, post, user, writers, count):
+        """Одновременный запуск писателей; итоги замера"""
+        clients = []
+        for _ in range(writers):
+            client = Client()
+            client.force_login(user)
+            clients.append(client)
+        # Соединения открываются заново с PRAGMA текущего замера.
+        connections.close_all()
+        url = reverse('blog:add_comment', args=[post.id])
+        barrier = threading.Barrier(writers + 1)
+        outcomes = []
+        threads = [
+            threading.Thread(
+                target=self.write_comments,
+                args=(client, url, count, barrier, outcomes)
+            )
+            for client in clients
+        ]
+        for thread in threads:
+            thread.start()
+        barrier.wait()
+        start = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        return outcomes, time.perf_counter() - start
+
+    def handle(self, *args, **options):
+        post = Post.objects.filter(is_visible=True).first()
+        if post is None:
+            self.stderr.write('Нет опубликованных публикаций')
+            return
+        user = User.objects.get_or_create(username='stress_writer')[0]
+        overrides = DEFAULT_SQLITE if options['default_sqlite'] else {}
+        with override_settings(**overrides):
+            outcomes, elapsed = self.run(
+                post, user, options['writers'], options['comments']
+            )
+            with connection.cursor() as cursor:
+                cursor.execute('PRAGMA journal_mode')
+                journal_mode = cursor.fetchone()[0]
+        counts = Counter(outcome for outcome, _ in outcomes)
+        timings = [timing for _, timing in outcomes]
+        p95 = quantiles(timings, n=20)[-1] if len(timings) > 1 else 0
+        self.stdout.write(
+            f'journal_mode={journal_mode}, '
+            f'писателей {options["writers"]}: '
+            f'создано {counts["created"]}, '
+            f'ошибок блокировки {counts["locked"]}, '
+            f'{counts["created"] / elapsed:.1f} комментариев/с, '
+            f'p95 {p95 * 1000:.0f} мс'
+        )
+        if not options['keep']:
+            Comment.objects.filter(author=user).delete()
@@ -0,0 +1,31 @@
+"""Команда для предварительной компиляции шаблонов проекта."""
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.template import TemplateSyntaxError, engines
+
+
+class Command(BaseCommand):
+    help = (
+        'Компилирует все шаблоны из каталогов TEMPLATES DIRS. С cached '
+        'loader скомпилированные шаблоны остаются в памяти процесса; '
+        'ошибки синтаксиса шаблонов завершают команду с ошибкой'
+    )
+
+    def handle(self, *args, **options):
+        engine = engines['django']
+        errors = []
+        compiled = 0
+        for directory in map(Path, engine.engine.dirs):
+            for path in sorted(directory.rglob('*.html')):
+                name = path.relative_to(directory).as_posix()
+                try:
+                    engine.get_template(name)
+                except TemplateSyntaxError as error:
+                    errors.append(f'{name}: {error}')
+                else:
+                    compiled += 1
+        if options['verbosity']:
+            self.stdout.write(f'Скомпилировано шаблонов: {compiled}')
+        if errors:
+            raise CommandError('\n'.join(errors))
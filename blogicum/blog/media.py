@@ -0,0 +1,150 @@
+"""Отдача изображений публикаций.
+
+Поддерживаются условные запросы (ETag, If-None-Match, If-Modified-Since),
+запросы части файла (Range) и передача файла прокси-серверу
+(X-Accel-Redirect, X-Sendfile), если приложение работает за ним.
+"""
+import mimetypes
+import os
+import posixpath
+import re
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import (
+    FileResponse, Http404, HttpResponse, StreamingHttpResponse
+)
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.http import require_safe
+
+from .models import Post
+
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+CHUNK_SIZE = 64 * 1024
+# Только оригиналы: копии <хэш>.card.webp пересоздаются под тем же именем.
+CONTENT_NAME = re.compile(r'[0-9a-f]{64}\.[a-z0-9]+')
+RANGE = re.compile(r'bytes=(\d*)-(\d*)')
+
+
+def file_etag(name, stat):
+    """Сильный ETag: имя оригинала по хэшу содержимого или время и размер"""
+    basename = posixpath.basename(name)
+    if CONTENT_NAME.fullmatch(basename):
+        return quote_etag(basename)
+    return quote_etag(f'{stat.st_mtime_ns:x}-{stat.st_size:x}')
+
+
+def cache_control(name):
+    """Заголовок Cache-Control для файла"""
+    if CONTENT_NAME.fullmatch(posixpath.basename(name)):
+        return f'public, max-age={IMMUTABLE_MAX_AGE}, immutable'
+    return f'public, max-age={settings.MEDIA_CACHE_MAX_AGE}'
+
+
+def parse_range(header, size):
+    """Границы запрошенной части файла, None для всего файла или ValueError
+
+    Поддерживается один диапазон; запрос нескольких отдаётся целиком.
+    """
+    match = RANGE.fullmatch(header.replace(' ', ''))
+    if not match or match.group(1) == match.group(2) == '':
+        return None
+    first, last = match.groups()
+    if first == '':
+        start, end = max(size - int(last), 0), size - 1
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    if start > end or start >= size:
+        raise ValueError(header)
+    return start, end
+
+
+def read_range(file, start, length):
+    """Чтение части файла блоками"""
+    with file:
+        file.seek(start)
+        while length > 0:
+            chunk = file.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def offload(name, path):
+    """Ответ, по которому файл отдаст прокси-сервер"""
+    response = HttpResponse()
+    # Тип определит прокси-сервер по расширению файла.
+    del response['Content-Type']
+    if settings.MEDIA_SENDFILE == 'x-accel-redirect':
+        response['X-Accel-Redirect'] = (
+            settings.MEDIA_ACCEL_REDIRECT_PREFIX + name
+        )
+    else:
+        response['X-Sendfile'] = path
+    return response
+
+
+def ranged_response(request, file, size, etag):
+    """Ответ 200, 206 или 416 по заголовкам Range и If-Range"""
+    header = request.headers.get('Range')
+    if_range = request.headers.get('If-Range')
+    if header and (if_range is None or if_range == etag):
+        try:
+            part = parse_range(header, size)
+        except ValueError:
+            file.close()
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+        if part is not None:
+            start, end = part
+            response = StreamingHttpResponse(
+                read_range(file, start, end - start + 1), status=206
+            )
+            response['Content-Range'] = f'bytes {start}-{end}/{size}'
+            response['Content-Length'] = end - start + 1
+            return response
+    return FileResponse(file)
+
+
+@require_safe
+def serve_post_image(request, name):
+    """Изображение публикации или его уменьшенная копия"""
+    storage = Post._meta.get_field('image').storage
+    # ../ в пути не должен выводить из каталога изображений публикаций.
+    name = posixpath.normpath(posixpath.join('post_images', name))
+    if (not name.startswith('post_images/')
+            or posixpath.basename(name).startswith('.')):
+        raise Http404
+    try:
+        path = storage.path(name)
+        file = open(path, 'rb')
+    except (SuspiciousFileOperation, OSError):
+        raise Http404
+    stat = os.fstat(file.fileno())
+    etag = file_etag(name, stat)
+    headers = {
+        'ETag': etag,
+        'Last-Modified': http_date(stat.st_mtime),
+        'Cache-Control': cache_control(name),
+        'Accept-Ranges': 'bytes',
+    }
+    not_modified = get_conditional_response(
+        request, etag=etag, last_modified=int(stat.st_mtime)
+    )
+    if not_modified is not None or settings.MEDIA_SENDFILE:
+        file.close()
+        response = not_modified or offload(name, path)
+    else:
+        response = ranged_response(request, file, stat.st_size, etag)
+        if response.status_code != 416:
+            content_type, encoding = mimetypes.guess_type(name)
+            response['Content-Type'] = (
+                content_type or 'application/octet-stream'
+            )
+    for header, value in headers.items():
+        response[header] = value
+    return response
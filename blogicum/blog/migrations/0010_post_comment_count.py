@@ -0,0 +1,31 @@
+# Generated by Django 3.2.16 on 2026-10-18 02:18
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_comments(apps, schema_editor):
+    Comment = apps.get_model('blog', 'Comment')
+    Post = apps.get_model('blog', 'Post')
+    db_alias = schema_editor.connection.alias
+    comment_count = Comment.objects.using(db_alias).filter(
+        post=OuterRef('pk')
+    ).order_by().values('post').annotate(count=Count('pk')).values('count')
+    Post.objects.using(db_alias).update(comment_count=Coalesce(Subquery(comment_count), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0009_post_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Число комментариев'),
+        ),
+        migrations.RunPython(count_comments, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.16 on 2026-10-18 02:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0011_comment_post_created_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='image_meta',
+            field=models.JSONField(blank=True, editable=False, null=True, verbose_name='Сведения об изображении'),
+        ),
+    ]
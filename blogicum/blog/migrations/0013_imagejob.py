@@ -0,0 +1,40 @@
+# Generated by Django 3.2.16 on 2026-10-18 02:32
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0012_post_image_renditions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('image', models.CharField(max_length=100, verbose_name='Изображение')),
+                ('status', models.CharField(choices=[('pending', 'Ожидает'), ('running', 'Выполняется'), ('done', 'Выполнено'), ('failed', 'Ошибка')], default='pending', max_length=16, verbose_name='Статус')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Попыток')),
+                ('error', models.TextField(blank=True, verbose_name='Ошибка')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Добавлено')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='Начато')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='image_jobs', to='blog.post', verbose_name='Публикация')),
+            ],
+            options={
+                'verbose_name': 'задание обработки изображения',
+                'verbose_name_plural': 'Задания обработки изображений',
+                'ordering': ('created_at',),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='imagejob',
+            index=models.Index(fields=['status', 'created_at'], name='imagejob_status_created_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='imagejob',
+            constraint=models.UniqueConstraint(fields=('post', 'image'), name='imagejob_post_image_unique'),
+        ),
+    ]
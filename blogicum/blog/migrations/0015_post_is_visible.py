@@ -0,0 +1,31 @@
+# Generated by Django 3.2.16 on 2026-10-18 02:37
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def mark_visible_posts(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    Post.objects.using(schema_editor.connection.alias).filter(
+        is_published=True, pub_date__lte=timezone.now()
+    ).update(is_visible=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0014_post_image_storage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='is_visible',
+            field=models.BooleanField(default=False, editable=False, verbose_name='Видна всем'),
+        ),
+        migrations.RunPython(mark_visible_posts, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('is_visible', True)), fields=['-pub_date'], name='post_visible_pub_date_idx'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+from django.conf import settings
+from django.db import migrations
+
+FTS_TABLE = 'blog_post_fts'
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+            f"title, text, tokenize = 'unicode61 remove_diacritics 2')"
+        )
+        # Совпадение в заголовке весит больше, чем в тексте.
+        schema_editor.execute(
+            f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rank) "
+            f"VALUES ('rank', 'bm25(10.0, 1.0)')"
+        )
+        # «ё» заменяется на «е», как в blog.search.fold.
+        schema_editor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, text) SELECT id, '
+            f"REPLACE(REPLACE(title, 'ё', 'е'), 'Ё', 'Е'), "
+            f"REPLACE(REPLACE(text, 'ё', 'е'), 'Ё', 'Е') FROM blog_post"
+        )
+    elif vendor == 'postgresql':
+        schema_editor.execute(
+            f"CREATE INDEX post_search_idx ON blog_post USING gin ("
+            f"to_tsvector('{settings.SEARCH_CONFIG}'::regconfig, "
+            f"title || ' ' || text))"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE {FTS_TABLE}')
+    elif vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX post_search_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0015_post_is_visible'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
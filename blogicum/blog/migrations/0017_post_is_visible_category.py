@@ -0,0 +1,21 @@
+# Generated by Django 3.2.16 on 2026-10-18 02:55
+
+from django.db import migrations, models
+
+
+def hide_unpublished_posts(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    Post.objects.using(schema_editor.connection.alias).filter(
+        models.Q(category=None) | models.Q(category__is_published=False)
+    ).update(is_visible=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0016_post_search_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(hide_unpublished_posts, migrations.RunPython.noop),
+    ]
@@ -5,10 +5,27 @@
 """
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.utils import timezone
+
+from .renditions import get_rendition
+from .storage import post_image_storage
 
 User = get_user_model()
 
 
+def post_visibility(category_published, now=None):
+    """Значение is_visible для UPDATE публикаций категории"""
+    if not category_published:
+        return models.Value(False)
+    return models.Case(
+        models.When(
+            models.Q(is_published=True, pub_date__lte=now or timezone.now()),
+            then=models.Value(True)
+        ),
+        default=models.Value(False),
+    )
+
+
 class PublishedCreated(models.Model):
     """Модель для добавления полей отметки о публикации и времени создания"""
 
@@ -88,12 +105,117 @@ class Post(PublishedCreated):
         related_name='posts'
     )
     image = models.ImageField('Изображение', upload_to='post_images',
-                              blank=True)
+                              blank=True, storage=post_image_storage)
+    # {'width': ..., 'height': ..., 'renditions': созданы ли копии}
+    image_meta = models.JSONField(
+        null=True, blank=True, editable=False,
+        verbose_name='Сведения об изображении'
+    )
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='Изменено')
+    # Публикация, её категория опубликованы и время публикации наступило.
+    # Пересчитывается в save(), при изменении категории и планировщиком,
+    # чтобы запросы лент не соединялись с blog_category.
+    is_visible = models.BooleanField(
+        default=False, editable=False, verbose_name='Видна всем'
+    )
+    comment_count = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Число комментариев'
+    )
 
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         ordering = ('-pub_date',)
+        indexes = (
+            models.Index(
+                fields=('is_published', '-pub_date'),
+                name='post_published_pub_date_idx'
+            ),
+            models.Index(
+                fields=('author', '-pub_date'),
+                name='post_author_pub_date_idx'
+            ),
+            models.Index(
+                fields=('category', '-pub_date'),
+                name='post_category_pub_date_idx'
+            ),
+            models.Index(
+                fields=('-pub_date',),
+                name='post_live_pub_date_idx',
+                condition=models.Q(is_published=True)
+            ),
+            models.Index(
+                fields=('-pub_date',),
+                name='post_visible_pub_date_idx',
+                condition=models.Q(is_visible=True)
+            ),
+        )
+
+    @property
+    def renditions_ready(self):
+        """Созданы ли уменьшенные копии изображения"""
+        return bool(self.image_meta and self.image_meta.get('renditions'))
+
+    @property
+    def card_image(self):
+        """Копия изображения для карточки ленты"""
+        return get_rendition(self, 'card')
+
+    @property
+    def detail_image(self):
+        """Копия изображения для страницы публикации"""
+        return get_rendition(self, 'detail')
+
+    @property
+    def original_image(self):
+        """Загруженное изображение"""
+        return get_rendition(self, 'original')
+
+    def is_pub_date_reached(self):
+        """Наступило ли время публикации"""
+        pub_date = self.pub_date
+        if pub_date is None:
+            return False
+        if timezone.is_naive(pub_date):
+            pub_date = timezone.make_aware(pub_date)
+        return pub_date <= timezone.now()
+
+    def is_category_published(self):
+        """Опубликована ли категория по её состоянию в БД"""
+        return self.category_id is not None and Category.objects.filter(
+            pk=self.category_id, is_published=True
+        ).exists()
+
+    def save(self, *args, **kwargs):
+        """Сохранение без перезаписи счётчика комментариев"""
+        # Отложенную публикацию выпускает команда publish_scheduled.
+        self.is_visible = (
+            self.is_published
+            and self.is_pub_date_reached()
+            and self.is_category_published()
+        )
+        if not self.image:
+            self.image_meta = None
+        elif not self.image._committed:
+            # Копии нового изображения создаёт обработчик post_save.
+            self.image_meta = {
+                'width': self.image.width,
+                'height': self.image.height,
+                'renditions': False,
+            }
+        if not (
+            self._state.adding
+            or self.pk is None
+            or kwargs.get('force_insert')
+            or kwargs.get('update_fields') is not None
+        ):
+            # Счётчик меняется только запросами UPDATE ... SET F() + 1,
+            # поэтому значение из памяти может быть устаревшим.
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'comment_count'
+            ]
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return (
@@ -125,3 +247,59 @@ class Comment(models.Model):
         verbose_name = 'коментарий'
         verbose_name_plural = 'коментарии'
         ordering = ('created_at',)
+        indexes = (
+            models.Index(
+                fields=('post', 'created_at', 'id'),
+                name='comment_post_created_idx'
+            ),
+        )
+
+
+class ImageJob(models.Model):
+    """Задание на создание копий изображения публикации"""
+
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUSES = (
+        (PENDING, 'Ожидает'),
+        (RUNNING, 'Выполняется'),
+        (DONE, 'Выполнено'),
+        (FAILED, 'Ошибка'),
+    )
+
+    post = models.ForeignKey(
+        Post, on_delete=models.CASCADE,
+        verbose_name='Публикация',
+        related_name='image_jobs'
+    )
+    image = models.CharField('Изображение', max_length=100)
+    status = models.CharField(
+        'Статус', max_length=16, choices=STATUSES, default=PENDING
+    )
+    attempts = models.PositiveSmallIntegerField('Попыток', default=0)
+    error = models.TextField('Ошибка', blank=True)
+    created_at = models.DateTimeField(
+        auto_now_add=True, verbose_name='Добавлено'
+    )
+    started_at = models.DateTimeField('Начато', null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'задание обработки изображения'
+        verbose_name_plural = 'Задания обработки изображений'
+        ordering = ('created_at',)
+        indexes = (
+            models.Index(
+                fields=('status', 'created_at'),
+                name='imagejob_status_created_idx'
+            ),
+        )
+        constraints = (
+            models.UniqueConstraint(
+                fields=('post', 'image'), name='imagejob_post_image_unique'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.post_id} - {self.status}'
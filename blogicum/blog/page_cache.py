@@ -0,0 +1,111 @@
+"""Кэширование страниц для неавторизованных читателей.
+
+Ключ страницы строится из пути, номера страницы (или курсора) и версий
+тегов страницы. Изменение данных меняет версию тегов затронутых страниц
+(invalidate_pages), и старые записи больше не находятся по ключу, а затем
+вытесняются из кэша.
+"""
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+TAG_KEY = 'page_tag:{}'
+PAGE_KEY = 'page:{}'
+HITS_KEY = 'page_cache:hits'
+MISSES_KEY = 'page_cache:misses'
+PAGE_QUERY_PARAMS = ('page', 'cursor')
+
+
+def page_cache():
+    return caches[settings.PAGE_CACHE_ALIAS]
+
+
+def tag_versions(tags):
+    """Текущие версии тегов; новые теги получают случайную версию"""
+    cache = page_cache()
+    keys = [TAG_KEY.format(tag) for tag in tags]
+    versions = cache.get_many(keys)
+    missing = {key: uuid.uuid4().hex for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, None)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+def invalidate_pages(*tags):
+    """Сброс страниц с любым из тегов сейчас и после коммита"""
+    def bump_versions():
+        page_cache().set_many(
+            {TAG_KEY.format(tag): uuid.uuid4().hex for tag in set(tags)},
+            None
+        )
+
+    bump_versions()
+    # Иначе параллельный запрос может успеть закэшировать старую страницу.
+    transaction.on_commit(bump_versions)
+
+
+def page_cache_key(request, tags):
+    params = [
+        f'{name}={request.GET[name]}'
+        for name in PAGE_QUERY_PARAMS if name in request.GET
+    ]
+    key = '|'.join([request.path, *params, *tag_versions(tags)])
+    return PAGE_KEY.format(hashlib.md5(key.encode()).hexdigest())
+
+
+def increment(key):
+    cache = page_cache()
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Счётчик вытеснен из кэша между add и incr.
+        cache.add(key, 1, None)
+
+
+def page_cache_stats():
+    """Число попаданий и промахов кэша страниц"""
+    stats = page_cache().get_many([HITS_KEY, MISSES_KEY])
+    return {
+        'hits': stats.get(HITS_KEY, 0),
+        'misses': stats.get(MISSES_KEY, 0),
+    }
+
+
+class AnonymousPageCacheMixin:
+    """Миксин, кэширующий страницу для неавторизованных пользователей"""
+
+    page_cache_tags = ()
+
+    def get_page_cache_tags(self):
+        """Теги, по которым сбрасывается кэш страницы"""
+        return self.page_cache_tags
+
+    def dispatch(self, request, *args, **kwargs):
+        """Ответ из кэша или сохранение отрендеренного ответа в кэш"""
+        if request.method != 'GET' or request.user.is_authenticated:
+            return super().dispatch(request, *args, **kwargs)
+        key = page_cache_key(request, self.get_page_cache_tags())
+        response = page_cache().get(key)
+        if response is not None:
+            increment(HITS_KEY)
+            response['X-Page-Cache'] = 'hit'
+            return response
+        increment(MISSES_KEY)
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code != 200 or response.cookies:
+            return response
+
+        def store(response):
+            page_cache().set(key, response, settings.PAGE_CACHE_TIMEOUT)
+
+        if hasattr(response, 'render') and not response.is_rendered:
+            response.add_post_render_callback(store)
+        else:
+            store(response)
+        response['X-Page-Cache'] = 'miss'
+        return response
@@ -0,0 +1,196 @@
+"""Пагинаторы для лент публикаций."""
+import base64
+import json
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connections, transaction
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+FEED_COUNT_KEY = 'feed_count:{}'
+
+
+class InvalidCursor(Exception):
+    """Курсор не удалось разобрать"""
+
+
+def feed_count_cache_key(feed):
+    """Ключ кэша числа публикаций в ленте (index, category:..., profile:...)"""
+    return FEED_COUNT_KEY.format(feed)
+
+
+def invalidate_feed_counts(*feeds):
+    """Сброс числа публикаций в перечисленных лентах сейчас и после коммита"""
+    keys = [feed_count_cache_key(feed) for feed in feeds]
+    cache.delete_many(keys)
+    # Иначе параллельный запрос может успеть закэшировать старое число.
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+class CachedCountPaginator(Paginator):
+    """Постраничный пагинатор с кэшированным числом записей.
+
+    Число записей ленты хранится в кэше FEED_COUNT_CACHE_TIMEOUT секунд и
+    сбрасывается сигналами Post. При FEED_COUNT_ESTIMATE на PostgreSQL
+    вместо COUNT(*) берётся оценка планировщика.
+    """
+
+    def __init__(self, object_list, per_page, feed=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.feed = feed
+
+    def estimate_count(self):
+        """Оценка числа строк по плану запроса (только PostgreSQL)"""
+        connection = connections[self.object_list.db]
+        if connection.vendor != 'postgresql':
+            return None
+        sql, params = self.object_list.query.get_compiler(
+            self.object_list.db
+        ).as_sql()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+
+    @cached_property
+    def count(self):
+        if self.feed is None:
+            return super().count
+        if settings.FEED_COUNT_ESTIMATE:
+            estimate = self.estimate_count()
+            # Для небольших лент оценка неточна, а COUNT(*) дёшев.
+            if (estimate is not None
+                    and estimate >= settings.FEED_COUNT_ESTIMATE_MIN):
+                return estimate
+        return cache.get_or_set(
+            feed_count_cache_key(self.feed),
+            lambda: Paginator.count.func(self),
+            settings.FEED_COUNT_CACHE_TIMEOUT
+        )
+
+
+class CursorPage:
+    """Страница курсорной пагинации: только ссылки «вперёд» и «назад»"""
+
+    cursor_based = True
+
+    def __init__(self, object_list, paginator, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """Пагинация по ключу сортировки вместо OFFSET.
+
+    Страница выбирается условием «строго после/до последней показанной
+    записи» по полям ordering, поэтому стоимость запроса не зависит от
+    глубины страницы, а общее число записей не считается.
+    """
+
+    def __init__(self, object_list, per_page, ordering=('-pub_date', '-id')):
+        self.object_list = object_list
+        self.per_page = per_page
+        self.ordering = ordering
+
+    @property
+    def fields(self):
+        return [name.lstrip('-') for name in self.ordering]
+
+    def encode_cursor(self, item, direction):
+        values = [getattr(item, name) for name in self.fields]
+        data = json.dumps([direction, [
+            value.isoformat() if hasattr(value, 'isoformat') else value
+            for value in values
+        ]])
+        return base64.urlsafe_b64encode(data.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        try:
+            padding = '=' * (-len(cursor) % 4)
+            direction, values = json.loads(
+                base64.urlsafe_b64decode(cursor + padding)
+            )
+            if direction not in ('next', 'prev'):
+                raise ValueError
+            if len(values) != len(self.fields):
+                raise ValueError
+            model = self.object_list.model
+            values = [
+                model._meta.get_field(name).to_python(value)
+                for name, value in zip(self.fields, values)
+            ]
+        except Exception as error:
+            raise InvalidCursor(cursor) from error
+        return direction, values
+
+    def seek_filter(self, values, forward):
+        """Условие «после values» в порядке ordering (или «до» при обратном)"""
+        conditions = []
+        for position, name in enumerate(self.ordering):
+            field = name.lstrip('-')
+            descending = name.startswith('-')
+            lookup = 'lt' if descending == forward else 'gt'
+            equal = {
+                previous: value for previous, value in zip(
+                    self.fields[:position], values[:position]
+                )
+            }
+            conditions.append(
+                Q(**equal, **{f'{field}__{lookup}': values[position]})
+            )
+        return reduce(or_, conditions)
+
+    def page(self, cursor=None):
+        """Страница после (или до) записи, закодированной в курсоре"""
+        direction, values = (
+            self.decode_cursor(cursor) if cursor else ('next', None)
+        )
+        forward = direction == 'next'
+        ordering = self.ordering if forward else [
+            name[1:] if name.startswith('-') else f'-{name}'
+            for name in self.ordering
+        ]
+        queryset = self.object_list.order_by(*ordering)
+        if values is not None:
+            queryset = queryset.filter(self.seek_filter(values, forward))
+        items = list(queryset[:self.per_page + 1])
+        has_more = len(items) > self.per_page
+        items = items[:self.per_page]
+        if not forward:
+            items.reverse()
+        has_next = has_more if forward else True
+        has_previous = values is not None if forward else has_more
+        return CursorPage(
+            items,
+            self,
+            self.encode_cursor(items[-1], 'next')
+            if items and has_next else None,
+            self.encode_cursor(items[0], 'prev')
+            if items and has_previous else None,
+        )
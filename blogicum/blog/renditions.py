@@ -0,0 +1,97 @@
+"""Уменьшенные копии изображений публикаций.
+
+Для каждого загруженного изображения рядом с оригиналом сохраняются копии
+под карточку ленты и страницу публикации в форматах WebP и JPEG:
+post_images/photo.jpg -> post_images/photo.card.webp, photo.card.jpg, ...
+"""
+import logging
+import os
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+# Наибольшая ширина копии в пикселях; меньшие изображения не растягиваются.
+RENDITION_WIDTHS = {
+    'card': 640,
+    'detail': 1280,
+}
+# Расширение файла, формат Pillow и параметры сохранения.
+RENDITION_FORMATS = (
+    ('webp', 'WEBP', {'quality': 80, 'method': 4}),
+    ('jpg', 'JPEG', {'quality': 85, 'optimize': True, 'progressive': True}),
+)
+
+
+class Rendition:
+    """Копия изображения для разметки <picture>"""
+
+    def __init__(self, url, width, height, webp_url=None):
+        self.url = url
+        self.width = width
+        self.height = height
+        self.webp_url = webp_url
+
+
+def rendition_name(name, size, extension):
+    """Имя файла копии рядом с оригиналом"""
+    return f'{os.path.splitext(name)[0]}.{size}.{extension}'
+
+
+def rendition_size(width, height, size):
+    """Размер копии с сохранением пропорций оригинала"""
+    max_width = RENDITION_WIDTHS[size]
+    if width <= max_width:
+        return width, height
+    return max_width, max(1, round(height * max_width / width))
+
+
+def get_rendition(post, size):
+    """Копия изображения публикации или оригинал, пока копий нет"""
+    image = post.image
+    meta = post.image_meta or {}
+    width, height = meta.get('width'), meta.get('height')
+    if size in RENDITION_WIDTHS and width:
+        width, height = rendition_size(width, height, size)
+    if size not in RENDITION_WIDTHS or not post.renditions_ready:
+        return Rendition(image.url, width, height)
+    storage = image.storage
+    return Rendition(
+        storage.url(rendition_name(image.name, size, 'jpg')),
+        width,
+        height,
+        webp_url=storage.url(rendition_name(image.name, size, 'webp')),
+    )
+
+
+def save_rendition(storage, name, picture, image_format, options):
+    """Сохранение копии под заданным именем, заменяя прежний файл"""
+    buffer = BytesIO()
+    picture.save(buffer, format=image_format, **options)
+    storage.save_as(name, ContentFile(buffer.getvalue()))
+
+
+def generate_renditions(image):
+    """Создание всех копий; размер с учётом EXIF или None при ошибке"""
+    try:
+        with image.open('rb') as file:
+            picture = ImageOps.exif_transpose(Image.open(file))
+            picture = picture.convert('RGB')
+    except (OSError, ValueError) as error:
+        logger.warning('Не удалось открыть %s: %s', image.name, error)
+        return None
+    for size in RENDITION_WIDTHS:
+        resized = picture.resize(
+            rendition_size(*picture.size, size), Image.Resampling.LANCZOS
+        )
+        for extension, image_format, options in RENDITION_FORMATS:
+            save_rendition(
+                image.storage,
+                rendition_name(image.name, size, extension),
+                resized,
+                image_format,
+                options,
+            )
+    return picture.size
@@ -0,0 +1,74 @@
+"""Выпуск отложенных публикаций.
+
+Видимость публикации хранится в поле Post.is_visible, поэтому запросы
+лент не зависят от текущего времени и их результаты можно кэшировать.
+Когда наступает pub_date отложенной публикации, publish_due_posts
+отмечает её is_visible и сбрасывает кэши лент, в которые она попадает.
+"""
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import Post
+from .page_cache import invalidate_pages
+from .paginators import invalidate_feed_counts
+from .signals import invalidate_posts_pages, post_feeds
+
+
+def publication_time(now=None):
+    """Текущее время, округлённое вниз до PUBLICATION_TIME_GRANULARITY"""
+    now = now or timezone.now()
+    step = settings.PUBLICATION_TIME_GRANULARITY
+    return datetime.fromtimestamp(
+        now.timestamp() // step * step, tz=now.tzinfo
+    )
+
+
+def scheduled_posts():
+    """Скрытые публикации, которые станут видны по наступлении pub_date"""
+    return Post.objects.filter(
+        is_visible=False, is_published=True, category__is_published=True
+    )
+
+
+def due_posts(now=None):
+    """Отложенные публикации, время которых наступило"""
+    return scheduled_posts().filter(pub_date__lte=publication_time(now))
+
+
+def next_release_time():
+    """Шаг времени, в который выйдет ближайшая отложенная публикация"""
+    upcoming = scheduled_posts().order_by(
+        'pub_date'
+    ).values_list('pub_date', flat=True).first()
+    if upcoming is None:
+        return None
+    release = publication_time(upcoming)
+    if release < upcoming:
+        release += timedelta(seconds=settings.PUBLICATION_TIME_GRANULARITY)
+    return release
+
+
+def publish_due_posts(now=None):
+    """Выпуск наступивших публикаций; число выпущенных"""
+    now = publication_time(now)
+    post_ids = list(due_posts(now).values_list('id', flat=True))
+    if not post_ids:
+        return 0
+    posts = Post.objects.filter(id__in=post_ids)
+    feeds = {
+        feed
+        for category_slug, username in posts.order_by().values_list(
+            'category__slug', 'author__username'
+        ).distinct()
+        for feed in post_feeds(category_slug, username)
+    }
+    # Повторная проверка: публикацию могли перенести или снять.
+    published = due_posts(now).filter(id__in=post_ids).update(
+        is_visible=True, updated_at=timezone.now()
+    )
+    invalidate_feed_counts(*feeds)
+    invalidate_pages(*[f'feed:{feed}' for feed in feeds])
+    invalidate_posts_pages(posts)
+    return published
@@ -0,0 +1,160 @@
+"""Полнотекстовый поиск по публикациям.
+
+Индекс зависит от СУБД. На SQLite это виртуальная таблица FTS5
+blog_post_fts с копией заголовка и текста, которую обновляют обработчики
+сигналов Post. На PostgreSQL — GIN-индекс по выражению to_tsvector над
+заголовком и текстом, его обновляет сама СУБД. На остальных СУБД поиск
+выполняется через icontains без индекса. Бэкенд можно задать явно
+настройкой SEARCH_BACKEND.
+"""
+import re
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+from .models import Post
+
+FTS_TABLE = 'blog_post_fts'
+# Слов запроса сверх этого числа отбрасываются.
+MAX_TERMS = 8
+
+BACKENDS = {
+    'sqlite': 'blog.search.SqliteSearchBackend',
+    'postgresql': 'blog.search.PostgresSearchBackend',
+}
+
+
+def fold(text):
+    """Замена «ё» на «е»: токенизатор FTS5 их не отождествляет"""
+    return text.replace('ё', 'е').replace('Ё', 'Е')
+
+
+def fold_sql(column):
+    """Выражение SQL, выполняющее fold над столбцом"""
+    return f"REPLACE(REPLACE({column}, 'ё', 'е'), 'Ё', 'Е')"
+
+
+def search_terms(query):
+    """Слова поискового запроса в нижнем регистре"""
+    return re.findall(r'\w+', fold(query.lower()))[:MAX_TERMS]
+
+
+def get_search_backend(using='default'):
+    """Бэкенд поиска для базы данных using"""
+    path = settings.SEARCH_BACKEND or BACKENDS.get(
+        connections[using].vendor, 'blog.search.LikeSearchBackend'
+    )
+    return import_string(path)(using)
+
+
+class LikeSearchBackend:
+    """Поиск перебором через icontains, без индекса"""
+
+    def __init__(self, using):
+        self.using = using
+
+    def search(self, posts, query):
+        """Публикации, содержащие все слова запроса"""
+        terms = search_terms(query)
+        if not terms:
+            return posts.none()
+        for term in terms:
+            posts = posts.filter(
+                Q(title__icontains=term) | Q(text__icontains=term)
+            )
+        return posts.order_by('-pub_date', '-id')
+
+    def index_post(self, post):
+        """Обновление публикации в индексе"""
+
+    def remove_post(self, post_id):
+        """Удаление публикации из индекса"""
+
+    def rebuild(self):
+        """Перестроение индекса по всем публикациям"""
+
+
+class SqliteSearchBackend(LikeSearchBackend):
+    """Поиск по таблице FTS5; rowid записи индекса равен id публикации"""
+
+    def match_query(self, query):
+        """Запрос MATCH: все слова запроса как префиксы"""
+        return ' '.join(f'"{term}"*' for term in search_terms(query))
+
+    def search(self, posts, query):
+        """Публикации по запросу, более релевантные первыми"""
+        match = self.match_query(query)
+        if not match:
+            return posts.none()
+        # rank — bm25 с весами столбцов, чем меньше, тем релевантнее.
+        return posts.extra(
+            tables=[FTS_TABLE],
+            where=[
+                f'{FTS_TABLE}.rowid = {Post._meta.db_table}.id',
+                f'{FTS_TABLE} MATCH %s',
+            ],
+            params=[match],
+            select={'search_rank': f'{FTS_TABLE}.rank'},
+            order_by=['search_rank', '-pub_date', '-id'],
+        )
+
+    def execute(self, sql, params=()):
+        """Выполнение запроса к индексу"""
+        with connections[self.using].cursor() as cursor:
+            cursor.execute(sql, params)
+
+    def index_post(self, post):
+        """Замена записи публикации в индексе"""
+        self.remove_post(post.pk)
+        self.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, text) '
+            f'VALUES (%s, %s, %s)',
+            [post.pk, fold(post.title), fold(post.text)]
+        )
+
+    def remove_post(self, post_id):
+        """Удаление записи публикации из индекса"""
+        self.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [post_id])
+
+    def rebuild(self):
+        """Заполнение индекса заново из таблицы публикаций"""
+        self.execute(f'DELETE FROM {FTS_TABLE}')
+        self.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, text) '
+            f"SELECT id, {fold_sql('title')}, {fold_sql('text')} "
+            f'FROM {Post._meta.db_table}'
+        )
+        self.execute(
+            f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')"
+        )
+
+
+class PostgresSearchBackend(LikeSearchBackend):
+    """Поиск по GIN-индексу post_search_idx"""
+
+    def document(self):
+        """Выражение индекса; должно совпадать с выражением в миграции"""
+        table = Post._meta.db_table
+        return (
+            f"to_tsvector('{settings.SEARCH_CONFIG}'::regconfig, "
+            f"{table}.title || ' ' || {table}.text)"
+        )
+
+    def search(self, posts, query):
+        """Публикации по запросу, более релевантные первыми"""
+        if not search_terms(query):
+            return posts.none()
+        tsquery = (
+            f"websearch_to_tsquery('{settings.SEARCH_CONFIG}'::regconfig, %s)"
+        )
+        return posts.annotate(
+            search_rank=RawSQL(
+                f'ts_rank({self.document()}, {tsquery})', [query]
+            )
+        ).extra(
+            where=[f'{self.document()} @@ {tsquery}'],
+            params=[query],
+        ).order_by('-search_rank', '-pub_date', '-id')
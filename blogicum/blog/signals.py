@@ -0,0 +1,248 @@
+"""Обработчики сигналов моделей блога."""
+from threading import local
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.signals import user_logged_in
+from django.db.models import F
+from django.db.models.signals import (
+    post_delete, post_save, pre_delete, pre_save
+)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .auth import cache_user, invalidate_user
+from .jobs import enqueue_renditions
+from .models import Category, Comment, Location, Post, post_visibility
+from .page_cache import invalidate_pages
+from .paginators import invalidate_feed_counts
+from .search import get_search_backend
+
+# Если затронуто больше публикаций, сбрасываются страницы всех публикаций.
+MAX_INVALIDATED_POSTS = 1000
+
+# Публикации, удаляемые в текущем потоке вместе с их комментариями.
+deleting = local()
+
+
+def deleting_post_ids():
+    """Id публикаций, удаление которых сейчас выполняется"""
+    if not hasattr(deleting, 'post_ids'):
+        deleting.post_ids = set()
+    return deleting.post_ids
+
+
+def post_feeds(category_slug, username):
+    """Ленты, в которые попадает публикация"""
+    feeds = ['index', f'profile:{username}', f'profile:{username}:all']
+    if category_slug:
+        feeds.append(f'category:{category_slug}')
+    return feeds
+
+
+def stored_post_feeds(post_id):
+    """Ленты публикации по её сохранённому в БД состоянию"""
+    stored = Post.objects.filter(pk=post_id).values_list(
+        'category__slug', 'author__username'
+    ).first()
+    return post_feeds(*stored) if stored else []
+
+
+def invalidate_posts_pages(posts):
+    """Сброс страниц публикаций и лент, в которые они входят"""
+    slugs = posts.exclude(category=None).order_by().values_list(
+        'category__slug', flat=True
+    ).distinct()
+    post_ids = posts.values_list('id', flat=True)[:MAX_INVALIDATED_POSTS + 1]
+    invalidate_pages(
+        'feed:index',
+        *[f'feed:category:{slug}' for slug in slugs],
+        *(
+            [f'post:{post_id}' for post_id in post_ids]
+            if len(post_ids) <= MAX_INVALIDATED_POSTS else ['posts']
+        ),
+    )
+
+
+def touch_posts(posts, **fields):
+    """Обновление времени изменения, чтобы сбросить кэш карточек"""
+    posts.update(updated_at=timezone.now(), **fields)
+
+
+def authors_feeds(posts):
+    """Ленты профилей авторов публикаций"""
+    usernames = posts.order_by().values_list(
+        'author__username', flat=True
+    ).distinct()
+    return [
+        feed for username in usernames for feed in post_feeds(None, username)
+    ]
+
+
+def invalidate_categories_caches(slugs, posts):
+    """Сброс числа публикаций и страниц лент категорий и их авторов"""
+    # Число публикаций в профиле для других читателей зависит от того,
+    # опубликована ли категория.
+    invalidate_feed_counts(
+        'index',
+        *[f'category:{slug}' for slug in slugs],
+        *authors_feeds(posts)
+    )
+    invalidate_pages(*[f'feed:category:{slug}' for slug in slugs])
+
+
+def set_categories_published(categories, is_published):
+    """Публикация или снятие категорий вместе с пересчётом их публикаций"""
+    rows = list(categories.values_list('id', 'slug'))
+    ids = [category_id for category_id, _ in rows]
+    slugs = [slug for _, slug in rows]
+    Category.objects.filter(id__in=ids).update(is_published=is_published)
+    posts = Post.objects.filter(category_id__in=ids)
+    invalidate_categories_caches(slugs, posts)
+    invalidate_posts_pages(posts)
+    touch_posts(posts, is_visible=post_visibility(is_published))
+
+
+@receiver(pre_save, sender=Post)
+def remember_post_feeds(sender, instance, raw=False, **kwargs):
+    """Запоминание лент публикации до её изменения"""
+    if raw or instance.pk is None:
+        return
+    instance._previous_feeds = stored_post_feeds(instance.pk)
+
+
+@receiver(pre_delete, sender=Post)
+def remember_deleting_post(sender, instance, **kwargs):
+    """Отметка публикации, чьи комментарии удаляются каскадом"""
+    deleting_post_ids().add(instance.pk)
+
+
+@receiver(post_delete, sender=Post)
+def forget_deleted_post(sender, instance, **kwargs):
+    """Снятие отметки после удаления публикации"""
+    deleting_post_ids().discard(instance.pk)
+
+
+@receiver(post_save, sender=Post)
+def queue_image_renditions(sender, instance, raw=False, **kwargs):
+    """Постановка в очередь создания копий нового изображения"""
+    if raw or not instance.image or instance.renditions_ready:
+        return
+    enqueue_renditions(instance)
+
+
+@receiver(post_save, sender=Post)
+def index_saved_post(sender, instance, using, **kwargs):
+    """Обновление публикации в поисковом индексе"""
+    get_search_backend(using).index_post(instance)
+
+
+@receiver(post_delete, sender=Post)
+def unindex_deleted_post(sender, instance, using, **kwargs):
+    """Удаление публикации из поискового индекса"""
+    get_search_backend(using).remove_post(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Post)
+def invalidate_post_caches(sender, instance, raw=False, **kwargs):
+    """Сброс кэшей лент и страницы, затронутых изменением публикации"""
+    # Фикстура может загрузить публикацию раньше её автора и категории.
+    if raw:
+        return
+    feeds = {
+        *post_feeds(
+            instance.category.slug if instance.category_id else None,
+            instance.author.username
+        ),
+        *getattr(instance, '_previous_feeds', [])
+    }
+    invalidate_feed_counts(*feeds)
+    invalidate_pages(
+        f'post:{instance.pk}', *[f'feed:{feed}' for feed in feeds]
+    )
+
+
+def change_comment_count(post_id, delta):
+    """Атомарное изменение счётчика комментариев публикации"""
+    posts = Post.objects.filter(pk=post_id)
+    if delta < 0:
+        posts = posts.filter(comment_count__gte=-delta)
+    posts.update(comment_count=F('comment_count') + delta)
+
+
+@receiver(pre_save, sender=Comment)
+def remember_comment_post(sender, instance, raw=False, **kwargs):
+    """Запоминание публикации комментария до его изменения"""
+    if raw or instance.pk is None:
+        return
+    instance._previous_post_id = Comment.objects.filter(
+        pk=instance.pk
+    ).values_list('post_id', flat=True).first()
+
+
+@receiver(post_save, sender=Comment)
+def count_saved_comment(sender, instance, created, raw=False, **kwargs):
+    """Учёт нового или перенесённого в другую публикацию комментария"""
+    if raw:
+        return
+    previous_post_id = getattr(instance, '_previous_post_id', None)
+    if created:
+        change_comment_count(instance.post_id, 1)
+    elif previous_post_id not in (None, instance.post_id):
+        change_comment_count(previous_post_id, -1)
+        change_comment_count(instance.post_id, 1)
+
+
+@receiver(post_delete, sender=Comment)
+def count_deleted_comment(sender, instance, **kwargs):
+    """Уменьшение счётчика комментариев публикации"""
+    if instance.post_id in deleting_post_ids():
+        return
+    change_comment_count(instance.post_id, -1)
+
+
+@receiver([post_save, post_delete], sender=Comment)
+def invalidate_comment_caches(sender, instance, **kwargs):
+    """Сброс страницы публикации и лент, где выводится число комментариев"""
+    # Страницы удаляемой публикации сбрасывает обработчик сигналов Post.
+    post_ids = {
+        instance.post_id, getattr(instance, '_previous_post_id', None)
+    } - {None} - deleting_post_ids()
+    invalidate_pages(*[
+        tag for post_id in post_ids for tag in [
+            f'post:{post_id}',
+            *[f'feed:{feed}' for feed in stored_post_feeds(post_id)]
+        ]
+    ])
+
+
+@receiver([post_save, pre_delete], sender=Category)
+def invalidate_category_caches(sender, instance, signal, **kwargs):
+    """Сброс кэшей и пересчёт видимости публикаций категории"""
+    posts = Post.objects.filter(category=instance)
+    invalidate_categories_caches([instance.slug], posts)
+    invalidate_posts_pages(posts)
+    # У удаляемой категории публикации остаются без категории и скрываются.
+    touch_posts(posts, is_visible=post_visibility(
+        instance.is_published and signal is post_save
+    ))
+
+
+@receiver([post_save, pre_delete], sender=Location)
+def invalidate_location_caches(sender, instance, **kwargs):
+    """Сброс страниц и карточек публикаций с этим местоположением"""
+    invalidate_posts_pages(Post.objects.filter(location=instance))
+    touch_posts(Post.objects.filter(location=instance))
+
+
+@receiver(user_logged_in)
+def cache_logged_in_user(sender, user, **kwargs):
+    """Пользователь в кэше к первому запросу после входа"""
+    cache_user(user)
+
+
+@receiver([post_save, post_delete], sender=get_user_model())
+def invalidate_user_cache(sender, instance, update_fields=None, **kwargs):
+    """Сброс пользователя в кэше при изменении профиля или пароля"""
+    # Время входа обновляется при каждом входе и на сессию не влияет.
+    if update_fields != frozenset(('last_login',)):
+        invalidate_user(instance.pk)
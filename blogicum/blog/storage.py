@@ -0,0 +1,68 @@
+"""Хранилище изображений публикаций с адресацией по содержимому.
+
+Файл сохраняется под именем, равным SHA-256 его содержимого, в каталогах
+по первым символам хэша: post_images/ab/cd/abcd....jpg. Повторная загрузка
+того же изображения не создаёт новый файл, а ссылается на уже сохранённый.
+Файлы, на которые больше не ссылается ни одна публикация, удаляет команда
+collect_media_garbage.
+"""
+import hashlib
+import os
+import posixpath
+import uuid
+
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+HASH_CHUNK_SIZE = 64 * 1024
+
+
+def content_hash(content):
+    """SHA-256 содержимого файла, читаемого по частям"""
+    digest = hashlib.sha256()
+    if hasattr(content, 'seek'):
+        content.seek(0)
+    for chunk in content.chunks(HASH_CHUNK_SIZE):
+        digest.update(chunk)
+    if hasattr(content, 'seek'):
+        content.seek(0)
+    return digest.hexdigest()
+
+
+@deconstructible
+class ContentHashStorage(FileSystemStorage):
+    """Файловое хранилище без дубликатов одинаковых файлов"""
+
+    def content_name(self, name, content):
+        """Имя файла по хэшу содержимого в каталоге исходного имени"""
+        digest = content_hash(content)
+        extension = os.path.splitext(name)[1].lower()
+        return posixpath.join(
+            posixpath.dirname(name), digest[:2], digest[2:4],
+            f'{digest}{extension}'
+        )
+
+    def get_available_name(self, name, max_length=None):
+        # Одинаковое имя означает одинаковое содержимое.
+        return name
+
+    def _save(self, name, content):
+        name = self.content_name(name, content)
+        if self.exists(name):
+            return name
+        return self.save_as(name, content)
+
+    def save_as(self, name, content):
+        """Запись файла ровно под заданным именем с заменой прежнего"""
+        temporary = super()._save(
+            posixpath.join(
+                posixpath.dirname(name), f'.{uuid.uuid4().hex}.tmp'
+            ),
+            content
+        )
+        # Переименование атомарно: читатели видят старый или новый файл.
+        os.replace(self.path(temporary), self.path(name))
+        return name
+
+
+post_image_storage = ContentHashStorage()
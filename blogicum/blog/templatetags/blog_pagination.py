@@ -0,0 +1,20 @@
+"""Теги шаблонов для пагинации лент."""
+from django import template
+
+register = template.Library()
+
+PAGE_WINDOW_ON_EACH_SIDE = 3
+PAGE_WINDOW_ON_ENDS = 1
+
+
+@register.simple_tag
+def page_window(page, on_each_side=PAGE_WINDOW_ON_EACH_SIDE,
+                on_ends=PAGE_WINDOW_ON_ENDS):
+    """Номера страниц вокруг текущей и по краям; None на месте пропуска"""
+    paginator = page.paginator
+    return [
+        None if number == paginator.ELLIPSIS else number
+        for number in paginator.get_elided_page_range(
+            page.number, on_each_side=on_each_side, on_ends=on_ends
+        )
+    ]
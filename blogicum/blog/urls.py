@@ -5,8 +5,11 @@ app_name = 'blog'
 
 urlpatterns = [
     path('', views.PostListView.as_view(), name='index'),
+    path('search/', views.PostSearchView.as_view(), name='search'),
     path('posts/<int:post_id>/', views.PostDetailView.as_view(),
          name='post_detail'),
+    path('posts/<int:post_id>/comments/', views.PostCommentsView.as_view(),
+         name='post_comments'),
     path('category/<slug:category_slug>/', views.PostCategoryView.as_view(),
          name='category_posts'),
     path('profile/<str:username>/', views.ProfileListView.as_view(),
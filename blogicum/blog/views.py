@@ -12,44 +12,87 @@
 """
 
 
-from datetime import datetime
-
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Count
+from django.db.models import Q
+from django.http import Http404
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse
+from django.utils.functional import cached_property
+from django.utils.http import urlencode
 from django.views.generic import (
     DetailView, CreateView, ListView, UpdateView, DeleteView
 )
 
+from .db import RetryOnLockedMixin
 from .models import Category, Comment, Post, User
 from .forms import CommentForm, PostForm, UserForm
+from .page_cache import AnonymousPageCacheMixin
+from .paginators import CachedCountPaginator, CursorPaginator, InvalidCursor
+from .search import get_search_backend
 
 PAGINATOR_POST = 10
 PAGINATOR_CATEGORY = 10
 PAGINATOR_PROFILE = 10
+PAGINATOR_COMMENTS = 20
+PAGINATOR_SEARCH = 10
+
+
+def feed_post(posts):
+    """Подгрузка связанных объектов для карточек публикаций"""
+    return posts.select_related(
+        'author', 'category', 'location'
+    ).order_by(
+        '-pub_date'
+    )
+
+
+def published_post_filter():
+    """Условие, при котором публикация видна всем пользователям"""
+    return Q(is_visible=True)
 
 
 def filtered_post(posts, is_count_comments=True):
     """Функция для фильтрации публикаций по заданным критериям"""
     posts_query = posts.filter(
-        pub_date__lte=datetime.today(),
-        is_published=True,
-        category__is_published=True
+        published_post_filter()
     ).order_by(
         '-pub_date'
     )
-    return posts_query.annotate(
-        comment_count=Count('comments')
-    ) if is_count_comments else posts_query
+    return feed_post(posts_query) if is_count_comments else posts_query
+
+
+class FeedPaginationMixin:
+    """Миксин пагинации лент: кэш числа записей или курсор по настройке"""
+
+    paginator_class = CachedCountPaginator
 
+    def get_feed(self):
+        """Имя ленты для ключа кэша числа публикаций"""
+        raise NotImplementedError
 
-class PostCategoryView(ListView):
+    def get_paginator(self, *args, **kwargs):
+        """Передача имени ленты пагинатору"""
+        return super().get_paginator(*args, feed=self.get_feed(), **kwargs)
+
+    def paginate_queryset(self, queryset, page_size):
+        """Разбиение ленты по курсору ?cursor= вместо номера страницы"""
+        if not settings.FEED_CURSOR_PAGINATION:
+            return super().paginate_queryset(queryset, page_size)
+        paginator = CursorPaginator(queryset, page_size)
+        try:
+            page = paginator.page(self.request.GET.get('cursor'))
+        except InvalidCursor:
+            raise Http404('Неверный курсор страницы')
+        return paginator, page, page.object_list, page.has_other_pages()
+
+
+class PostCategoryView(AnonymousPageCacheMixin, FeedPaginationMixin,
+                       ListView):
     """Отображение списка публикаций в заданной категории"""
 
     model = Post
     template_name = 'blog/category.html'
-    context_object_name = 'page_obj'
     paginate_by = PAGINATOR_CATEGORY
 
     def get_queryset(self):
@@ -61,6 +104,14 @@ class PostCategoryView(ListView):
         )
         return filtered_post(self.category.posts.all())
 
+    def get_feed(self):
+        """Лента категории"""
+        return f'category:{self.category.slug}'
+
+    def get_page_cache_tags(self):
+        """Кэш страницы сбрасывается при изменениях в ленте категории"""
+        return [f'feed:category:{self.kwargs["category_slug"]}']
+
     def get_context_data(self, **kwargs):
         """Добавление информации о категории в контекст"""
         return dict(
@@ -69,18 +120,48 @@ class PostCategoryView(ListView):
         )
 
 
-class PostListView(ListView):
+class PostListView(AnonymousPageCacheMixin, FeedPaginationMixin, ListView):
     """Представление для отображения всех публикаций на главной странице"""
 
     paginate_by = PAGINATOR_POST
     template_name = 'blog/index.html'
+    page_cache_tags = ('feed:index',)
 
     def get_queryset(self):
         """Получение отфильтрованных публикаций"""
         return filtered_post(Post.objects.all())
 
+    def get_feed(self):
+        """Главная лента"""
+        return 'index'
+
+
+class PostSearchView(ListView):
+    """Поиск по заголовкам и текстам видимых публикаций"""
+
+    paginate_by = PAGINATOR_SEARCH
+    template_name = 'blog/search.html'
+
+    @cached_property
+    def query(self):
+        """Строка поиска из ?q="""
+        return self.request.GET.get('q', '').strip()
+
+    def get_queryset(self):
+        """Видимые публикации по запросу, более релевантные первыми"""
+        posts = filtered_post(Post.objects.all())
+        return get_search_backend(posts.db).search(posts, self.query)
+
+    def get_context_data(self, **kwargs):
+        """Добавление запроса в контекст и в ссылки пагинатора"""
+        return dict(
+            **super().get_context_data(**kwargs),
+            query=self.query,
+            page_query=urlencode({'q': self.query}) + '&'
+        )
+
 
-class PostCreateView(LoginRequiredMixin, CreateView):
+class PostCreateView(LoginRequiredMixin, RetryOnLockedMixin, CreateView):
     """Представление для создания новой публикации"""
 
     model = Post
@@ -99,36 +180,56 @@ class PostCreateView(LoginRequiredMixin, CreateView):
         )
 
 
-class PostDetailView(DetailView):
+class PostDetailView(AnonymousPageCacheMixin, DetailView):
     """Отображение подробной информации о публикации"""
 
     model = Post
     template_name = 'blog/detail.html'
     pk_url_kwarg = 'post_id'
 
+    def get_page_cache_tags(self):
+        """Кэш страницы сбрасывается при изменении публикации"""
+        return [f'post:{self.kwargs["post_id"]}', 'posts']
+
+    def get_comments_page(self):
+        """Страница комментариев после курсора ?cursor="""
+        paginator = CursorPaginator(
+            self.object.comments.select_related('author'),
+            PAGINATOR_COMMENTS,
+            ordering=('created_at', 'id')
+        )
+        try:
+            return paginator.page(self.request.GET.get('cursor'))
+        except InvalidCursor:
+            raise Http404('Неверный курсор страницы')
+
     def get_context_data(self, **kwargs):
         """Добавление комментариев и формы для добавления нового комментария"""
         return dict(
             **super().get_context_data(**kwargs),
             form=CommentForm(),
-            comments=self.object.comments.select_related('author')
+            comments=self.get_comments_page()
         )
 
     def get_object(self):
         """Получение публикации с учётом её статуса и прав доступа"""
-        posts = Post.objects
+        visible = published_post_filter()
+        if self.request.user.is_authenticated:
+            visible |= Q(author=self.request.user)
         return get_object_or_404(
-            posts.filter(
-                is_published=True
-            ) or posts.filter(
-                author=self.request.user
-            )
-            if self.request.user and self.request.user.is_authenticated
-            else filtered_post(Post.objects, is_count_comments=False),
-            pk=self.kwargs["post_id"],
+            Post.objects.select_related(
+                'author', 'category', 'location'
+            ).filter(visible),
+            pk=self.kwargs['post_id'],
         )
 
 
+class PostCommentsView(PostDetailView):
+    """Следующая страница комментариев публикации в виде HTML-фрагмента"""
+
+    template_name = 'includes/comment_list.html'
+
+
 class PostMixin(LoginRequiredMixin):
     """Миксин для проверки прав пользователя на публикацию"""
 
@@ -137,10 +238,15 @@ class PostMixin(LoginRequiredMixin):
     template_name = 'blog/create.html'
     pk_url_kwarg = 'post_id'
 
+    def get_object(self, queryset=None):
+        """Публикация загружается из БД один раз за запрос"""
+        if getattr(self, 'object', None) is None:
+            self.object = super().get_object(queryset)
+        return self.object
+
     def dispatch(self, request, *args, **kwargs):
         """Проверка, что публикация принадлежит текущему пользователю"""
-        post = get_object_or_404(Post, pk=self.kwargs['post_id'])
-        if post.author != self.request.user:
+        if self.get_object().author_id != request.user.id:
             return redirect(
                 'blog:post_detail',
                 post_id=self.kwargs['post_id']
@@ -148,7 +254,7 @@ class PostMixin(LoginRequiredMixin):
         return super().dispatch(request, *args, **kwargs)
 
 
-class PostUpdateView(PostMixin, UpdateView):
+class PostUpdateView(PostMixin, RetryOnLockedMixin, UpdateView):
     """Редактирование существующей публикации"""
 
     def get_success_url(self):
@@ -156,7 +262,7 @@ class PostUpdateView(PostMixin, UpdateView):
         return reverse('blog:post_detail', args=[self.kwargs['post_id']])
 
 
-class PostDeleteView(PostMixin, DeleteView):
+class PostDeleteView(PostMixin, RetryOnLockedMixin, DeleteView):
     """Удаление публикации"""
 
     def get_success_url(self):
@@ -164,30 +270,50 @@ class PostDeleteView(PostMixin, DeleteView):
         return reverse('blog:profile', args=[self.request.user.username])
 
 
-class ProfileListView(ListView):
+class ProfileListView(FeedPaginationMixin, ListView):
     """Просмотр профиля пользователя и его публикаций"""
 
     paginate_by = PAGINATOR_PROFILE
     template_name = 'blog/profile.html'
     model = Post
 
-    def get_object(self):
-        """Получение объекта пользователя по имени"""
+    @cached_property
+    def profile(self):
+        """Пользователь профиля, загруженный один раз за запрос"""
+        if self.request.user.get_username() == self.kwargs['username']:
+            return self.request.user
         return get_object_or_404(User, username=self.kwargs['username'])
 
+    @property
+    def is_owner(self):
+        """Профиль просматривает его владелец"""
+        return self.profile == self.request.user
+
     def get_queryset(self):
-        """Получение публикаций пользователя"""
-        return self.get_object().posts.all()
+        """Публикации пользователя; чужие снятые и отложенные скрыты"""
+        # Автор подставляется из profile, поэтому JOIN с auth_user не нужен.
+        posts = self.profile.posts.select_related(
+            'category', 'location'
+        ).order_by('-pub_date')
+        return posts if self.is_owner else posts.filter(
+            published_post_filter()
+        )
+
+    def get_feed(self):
+        """Лента профиля: у владельца в неё входят скрытые публикации"""
+        feed = f'profile:{self.kwargs["username"]}'
+        return f'{feed}:all' if self.is_owner else feed
 
     def get_context_data(self, **kwargs):
         """Добавление данных профиля в контекст"""
         return dict(
             **super().get_context_data(**kwargs),
-            profile=self.get_object()
+            profile=self.profile
         )
 
 
-class ProfileUpdateView(LoginRequiredMixin, UpdateView):
+class ProfileUpdateView(LoginRequiredMixin, RetryOnLockedMixin,
+                        UpdateView):
     """Редактирование данных профиля пользователя"""
 
     model = User
@@ -203,7 +329,8 @@ class ProfileUpdateView(LoginRequiredMixin, UpdateView):
         return reverse('blog:profile', args=[self.request.user.username])
 
 
-class CommentCreateView(LoginRequiredMixin, CreateView):
+class CommentCreateView(LoginRequiredMixin, RetryOnLockedMixin,
+                        CreateView):
     """Создание комментария к публикации"""
 
     model = Comment
@@ -232,27 +359,36 @@ class CommentMixin(LoginRequiredMixin):
     template_name = 'blog/comment.html'
     pk_url_kwarg = 'comment_id'
 
+    def get_queryset(self):
+        """Комментарии публикации из адреса страницы"""
+        return Comment.objects.filter(post_id=self.kwargs['post_id'])
+
+    def get_object(self, queryset=None):
+        """Комментарий загружается из БД один раз за запрос"""
+        if getattr(self, 'object', None) is None:
+            self.object = super().get_object(queryset)
+        return self.object
+
     def get_success_url(self):
         """Перенаправление на страницу публикации после действия с комментом"""
-        return reverse('blog:post_detail', args=[self.kwargs['comment_id']])
+        return reverse('blog:post_detail', args=[self.kwargs['post_id']])
 
     def dispatch(self, request, *args, **kwargs):
         """Проверка авторства комментария"""
-        comment = get_object_or_404(Comment, id=self.kwargs['comment_id'])
-        if comment.author != self.request.user:
+        if self.get_object().author_id != request.user.id:
             return redirect('blog:post_detail',
-                            post_id=self.kwargs['comment_id']
+                            post_id=self.kwargs['post_id']
                             )
         return super().dispatch(request, *args, **kwargs)
 
 
-class CommentUpdateView(CommentMixin, UpdateView):
+class CommentUpdateView(CommentMixin, RetryOnLockedMixin, UpdateView):
     """Редактирование комментария"""
 
     form_class = CommentForm
 
 
-class CommentDeleteView(CommentMixin, DeleteView):
+class CommentDeleteView(CommentMixin, RetryOnLockedMixin, DeleteView):
     """Удаление комментария"""
 
     ...
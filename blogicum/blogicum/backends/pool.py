@@ -0,0 +1,199 @@
+"""Пул соединений с БД внутри процесса.
+
+Бэкенды blogicum.backends.postgresql и blogicum.backends.sqlite3 берут
+соединения из пула при подключении и возвращают их туда вместо закрытия.
+Пул общий для потоков процесса (воркера) и ограничен POOL['MAX_SIZE']
+соединениями: если все заняты, поток ждёт до POOL['TIMEOUT'] секунд.
+Время ожидания накапливается в статистике пула (pool_stats).
+"""
+import threading
+import time
+from functools import partial
+
+from django.db.utils import OperationalError
+
+DEFAULT_MAX_SIZE = 4
+DEFAULT_TIMEOUT = 10
+
+pools = {}
+pools_lock = threading.Lock()
+
+
+def ping(connection):
+    """Проверка соединения запросом SELECT 1"""
+    try:
+        cursor = connection.cursor()
+        try:
+            cursor.execute('SELECT 1')
+        finally:
+            cursor.close()
+    except Exception:
+        return False
+    return True
+
+
+def close_quietly(connection):
+    """Закрытие соединения без исключений"""
+    try:
+        connection.close()
+    except Exception:
+        pass
+
+
+class PoolTimeout(OperationalError):
+    """Свободное соединение не появилось за время ожидания"""
+
+
+class ConnectionPool:
+    """Ограниченный набор открытых соединений, общий для потоков"""
+
+    def __init__(self, connect, max_size=DEFAULT_MAX_SIZE,
+                 timeout=DEFAULT_TIMEOUT, health_checks=False):
+        self.connect = connect
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_checks = health_checks
+        self.idle = []
+        self.size = 0
+        self.condition = threading.Condition()
+        self.counters = dict.fromkeys(
+            ('connects', 'acquired', 'waits', 'timeouts', 'discarded'), 0
+        )
+        self.wait_time = 0.0
+        self.max_wait = 0.0
+
+    def take(self):
+        """Свободное соединение или None, если можно открыть новое"""
+        start = time.monotonic()
+        waited = False
+        with self.condition:
+            while not self.idle and self.size >= self.max_size:
+                waited = True
+                remaining = self.timeout - (time.monotonic() - start)
+                if remaining <= 0:
+                    self.counters['timeouts'] += 1
+                    raise PoolTimeout(
+                        f'Нет свободного соединения за {self.timeout} с '
+                        f'(занято {self.size} из {self.max_size})'
+                    )
+                self.condition.wait(remaining)
+            if waited:
+                wait = time.monotonic() - start
+                self.counters['waits'] += 1
+                self.wait_time += wait
+                self.max_wait = max(self.max_wait, wait)
+            self.counters['acquired'] += 1
+            if self.idle:
+                return self.idle.pop()
+            self.size += 1
+            return None
+
+    def acquire(self):
+        """Соединение из пула и признак того, что оно уже использовалось"""
+        while True:
+            connection = self.take()
+            if connection is None:
+                break
+            if not self.health_checks or ping(connection):
+                return connection, True
+            self.discard(connection)
+        try:
+            connection = self.connect()
+        except Exception:
+            with self.condition:
+                self.size -= 1
+                self.condition.notify()
+            raise
+        with self.condition:
+            self.counters['connects'] += 1
+        return connection, False
+
+    def release(self, connection):
+        """Возврат соединения в пул"""
+        with self.condition:
+            self.idle.append(connection)
+            self.condition.notify()
+
+    def discard(self, connection):
+        """Закрытие неисправного соединения с освобождением места в пуле"""
+        close_quietly(connection)
+        with self.condition:
+            self.size -= 1
+            self.counters['discarded'] += 1
+            self.condition.notify()
+
+    def close_idle(self):
+        """Закрытие всех свободных соединений"""
+        with self.condition:
+            idle, self.idle = self.idle, []
+            self.size -= len(idle)
+        for connection in idle:
+            close_quietly(connection)
+
+    def stats(self):
+        """Размер пула и метрики ожидания соединений"""
+        with self.condition:
+            return {
+                'max_size': self.max_size,
+                'size': self.size,
+                'in_use': self.size - len(self.idle),
+                **self.counters,
+                'wait_time': round(self.wait_time, 6),
+                'max_wait': round(self.max_wait, 6),
+            }
+
+
+def pool_stats():
+    """Статистика пулов соединений этого процесса по псевдонимам БД"""
+    with pools_lock:
+        return {alias: pool.stats() for alias, pool in pools.items()}
+
+
+class PooledDatabaseWrapperMixin:
+    """Миксин DatabaseWrapper: соединения берутся из пула процесса"""
+
+    # Соединение взято из пула, а не открыто заново: обработчики
+    # connection_created могут не настраивать его повторно.
+    connection_reused = False
+
+    def get_pool(self, conn_params):
+        """Пул этого псевдонима БД, создаётся при первом подключении"""
+        with pools_lock:
+            if self.alias not in pools:
+                options = self.settings_dict.get('POOL') or {}
+                pools[self.alias] = ConnectionPool(
+                    partial(super().get_new_connection, conn_params),
+                    max_size=options.get('MAX_SIZE', DEFAULT_MAX_SIZE),
+                    timeout=options.get('TIMEOUT', DEFAULT_TIMEOUT),
+                    health_checks=self.settings_dict.get(
+                        'CONN_HEALTH_CHECKS', False
+                    ),
+                )
+            return pools[self.alias]
+
+    def get_new_connection(self, conn_params):
+        """Соединение из пула вместо нового подключения"""
+        connection, self.connection_reused = self.get_pool(
+            conn_params
+        ).acquire()
+        return connection
+
+    def _close(self):
+        """Возврат соединения в пул с откатом незавершённой транзакции"""
+        if self.connection is None:
+            return
+        pool = pools[self.alias]
+        if self.in_atomic_block:
+            # Django оставляет закрытое в транзакции соединение у обёртки
+            # до выхода из atomic, поэтому отдавать его другим нельзя.
+            pool.discard(self.connection)
+            return
+        try:
+            self.connection.rollback()
+        except Exception:
+            pool.discard(self.connection)
+            return
+        if self.errors_occurred and not self.is_usable():
+            pool.discard(self.connection)
+        else:
+            pool.release(self.connection)
@@ -0,0 +1,8 @@
+"""PostgreSQL с пулом соединений процесса (см. blogicum.backends.pool)."""
+from django.db.backends.postgresql import base
+
+from ..pool import PooledDatabaseWrapperMixin
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, base.DatabaseWrapper):
+    pass
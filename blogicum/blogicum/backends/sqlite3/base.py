@@ -0,0 +1,8 @@
+"""SQLite с пулом соединений процесса (см. blogicum.backends.pool)."""
+from django.db.backends.sqlite3 import base
+
+from ..pool import PooledDatabaseWrapperMixin
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, base.DatabaseWrapper):
+    pass
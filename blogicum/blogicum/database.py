@@ -0,0 +1,101 @@
+"""Настройки баз данных из переменных окружения.
+
+DB_ENGINE              sqlite3, postgresql или путь к бэкенду Django;
+DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT — параметры подключения;
+DB_CONN_MAX_AGE        сколько секунд держать соединение открытым между
+                       запросами; 0 — закрывать после каждого запроса,
+                       none — без ограничения;
+DB_CONN_HEALTH_CHECKS  проверять постоянное соединение в начале запроса
+                       (см. blog.db.check_connections);
+DB_POOL                брать соединения из пула процесса
+                       (см. blogicum.backends.pool);
+DB_POOL_MAX_SIZE       соединений в пуле одного процесса;
+DB_POOL_TIMEOUT        сколько секунд ждать свободного соединения;
+DB_REPLICA_HOSTS       хосты реплик для чтения через запятую, host[:port].
+
+Незаданные переменные берутся из DATABASES['default'] в settings.py.
+"""
+from django.core.exceptions import ImproperlyConfigured
+
+ENGINES = {
+    'sqlite3': 'django.db.backends.sqlite3',
+    'postgresql': 'django.db.backends.postgresql',
+}
+POOLED_ENGINES = {
+    'django.db.backends.sqlite3': 'blogicum.backends.sqlite3',
+    'django.db.backends.postgresql': 'blogicum.backends.postgresql',
+}
+TRUE_VALUES = ('1', 'true', 'yes', 'on')
+
+DEFAULT_CONN_MAX_AGE = 60
+DEFAULT_POOL_MAX_SIZE = 4
+DEFAULT_POOL_TIMEOUT = 10
+
+
+def env_bool(environ, name, default=False):
+    """Логическое значение переменной окружения"""
+    if name not in environ:
+        return default
+    return environ[name].strip().lower() in TRUE_VALUES
+
+
+def env_number(environ, name, default, convert=int):
+    """Числовое значение переменной окружения"""
+    value = environ.get(name, '').strip()
+    if not value:
+        return default
+    try:
+        return convert(value)
+    except ValueError:
+        raise ImproperlyConfigured(f'{name}: ожидается число, а не {value!r}')
+
+
+def conn_max_age(environ):
+    """CONN_MAX_AGE из DB_CONN_MAX_AGE; None — без ограничения"""
+    if environ.get('DB_CONN_MAX_AGE', '').strip().lower() == 'none':
+        return None
+    return env_number(environ, 'DB_CONN_MAX_AGE', DEFAULT_CONN_MAX_AGE)
+
+
+def replica_settings(primary, host):
+    """Настройки реплики: основная БД на другом хосте"""
+    host, _, port = host.strip().partition(':')
+    return {**primary, 'HOST': host, 'PORT': port or primary.get('PORT', '')}
+
+
+def database_settings(environ, default):
+    """DATABASES и DATABASE_REPLICAS по переменным окружения"""
+    engine = environ.get('DB_ENGINE', default['ENGINE'])
+    primary = {
+        **default,
+        'ENGINE': ENGINES.get(engine, engine),
+        'CONN_MAX_AGE': conn_max_age(environ),
+        'CONN_HEALTH_CHECKS': env_bool(environ, 'DB_CONN_HEALTH_CHECKS'),
+    }
+    for key in ('NAME', 'USER', 'PASSWORD', 'HOST', 'PORT'):
+        if f'DB_{key}' in environ:
+            primary[key] = environ[f'DB_{key}']
+    if env_bool(environ, 'DB_POOL'):
+        if primary['ENGINE'] not in POOLED_ENGINES:
+            raise ImproperlyConfigured(
+                f'Пул соединений не поддерживается для {primary["ENGINE"]}'
+            )
+        primary['ENGINE'] = POOLED_ENGINES[primary['ENGINE']]
+        # Соединение возвращается в пул в конце каждого запроса.
+        primary['CONN_MAX_AGE'] = 0
+        primary['POOL'] = {
+            'MAX_SIZE': env_number(
+                environ, 'DB_POOL_MAX_SIZE', DEFAULT_POOL_MAX_SIZE
+            ),
+            'TIMEOUT': env_number(
+                environ, 'DB_POOL_TIMEOUT', DEFAULT_POOL_TIMEOUT, float
+            ),
+        }
+    databases = {'default': primary}
+    replicas = []
+    hosts = environ.get('DB_REPLICA_HOSTS', '')
+    for number, host in enumerate(filter(None, hosts.split(',')), 1):
+        alias = f'replica_{number}'
+        databases[alias] = replica_settings(primary, host)
+        replicas.append(alias)
+    return databases, replicas
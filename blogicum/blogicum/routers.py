@@ -0,0 +1,87 @@
+"""Маршрутизация запросов между основной БД и репликами для чтения.
+
+Реплики перечислены в DATABASE_REPLICAS. С реплики читают только
+GET- и HEAD-запросы, обработанные ReplicaRoutingMiddleware; команды,
+фоновые задания и запросы, изменяющие данные, работают с основной БД.
+После записи пользователь получает cookie PIN_COOKIE и следующие
+REPLICA_PIN_SECONDS секунд читает с основной БД, чтобы сразу видеть
+свои публикации и комментарии, ещё не дошедшие до реплики.
+"""
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+PIN_COOKIE = 'primary_db_pin'
+SAFE_METHODS = ('GET', 'HEAD')
+
+routing = ContextVar('db_routing', default=None)
+
+
+class RequestRouting:
+    """Выбор БД для чтения в рамках одного HTTP-запроса"""
+
+    def __init__(self, replica):
+        self.replica = replica
+        self.wrote = False
+
+    @property
+    def read_alias(self):
+        """Реплика, пока в этом запросе ничего не записано"""
+        return DEFAULT_DB_ALIAS if self.wrote else self.replica
+
+
+class PrimaryReplicaRouter:
+    """Чтение с реплики внутри запроса на чтение, запись в основную БД"""
+
+    def db_for_read(self, model, **hints):
+        """Реплика запроса или основная БД"""
+        request_routing = routing.get()
+        if request_routing is None:
+            return DEFAULT_DB_ALIAS
+        return request_routing.read_alias
+
+    def db_for_write(self, model, **hints):
+        """Основная БД; после записи запрос читает тоже с неё"""
+        request_routing = routing.get()
+        if request_routing is not None:
+            request_routing.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        """Реплики содержат те же данные, что и основная БД"""
+        return True
+
+
+class ReplicaRoutingMiddleware:
+    """Направление чтения на реплику и закрепление за основной БД"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def uses_replica(self, request):
+        """Можно ли читать с реплики в этом запросе"""
+        return (
+            bool(settings.DATABASE_REPLICAS)
+            and request.method in SAFE_METHODS
+            and PIN_COOKIE not in request.COOKIES
+        )
+
+    def __call__(self, request):
+        """Обработка запроса с выбранной для чтения БД"""
+        request_routing = RequestRouting(
+            random.choice(settings.DATABASE_REPLICAS)
+            if self.uses_replica(request) else DEFAULT_DB_ALIAS
+        )
+        token = routing.set(request_routing)
+        try:
+            response = self.get_response(request)
+        finally:
+            routing.reset(token)
+        if request_routing.wrote and settings.DATABASE_REPLICAS:
+            response.set_cookie(
+                PIN_COOKIE, '1', max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True, samesite='Lax'
+            )
+        return response
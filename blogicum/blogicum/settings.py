@@ -33,6 +33,36 @@ ALLOWED_HOSTS = ['*']
 
 TEMPLATES_DIR = BASE_DIR / 'templates'
 
+# Курсорная пагинация лент (?cursor=) вместо постраничной (?page=)
+FEED_CURSOR_PAGINATION = False
+
+# Время жизни закэшированного числа публикаций в ленте, секунды
+FEED_COUNT_CACHE_TIMEOUT = 300
+
+# Оценка числа публикаций по статистике планировщика (только PostgreSQL)
+# для лент, в которых по оценке не меньше FEED_COUNT_ESTIMATE_MIN записей
+FEED_COUNT_ESTIMATE = False
+FEED_COUNT_ESTIMATE_MIN = 10000
+
+# Шаг, до которого округляется вниз текущее время при выпуске отложенных
+# публикаций, секунды: публикации выходят в начале минуты, а запросы
+# планировщика в пределах шага совпадают.
+PUBLICATION_TIME_GRANULARITY = 60
+
+# Бэкенд поиска публикаций (blog.search); None — по СУБД: FTS5 на SQLite,
+# GIN-индекс на PostgreSQL, icontains на остальных.
+SEARCH_BACKEND = None
+# Конфигурация текстового поиска PostgreSQL. После изменения нужно
+# пересоздать индекс post_search_idx: выражение в запросе и в индексе
+# должно совпадать.
+SEARCH_CONFIG = 'russian'
+
+# Копии изображений создаются в фоновых потоках процесса после коммита.
+# Если False, задания только сохраняются в БД и выполняются командой
+# process_image_jobs.
+IMAGE_JOBS_IN_PROCESS = True
+IMAGE_JOB_WORKERS = 2
+
 # Application definition
 
 INSTALLED_APPS = [
@@ -49,6 +79,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'blogicum.routers.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -77,6 +108,9 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'blogicum.wsgi.application'
 
+# Компилировать шаблоны при старте WSGI-приложения (см. warm_templates)
+WARM_TEMPLATES_ON_STARTUP = False
+
 
 # Database
 # https://docs.djangoproject.com/en/3.2/ref/settings/#databases
@@ -88,6 +122,60 @@ DATABASES = {
     }
 }
 
+# PRAGMA для каждого нового соединения SQLite (см. blog.db): WAL и ожидание
+# блокировки до busy_timeout мс вместо ошибки «database is locked».
+SQLITE_PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'busy_timeout': 5000,
+    # Отрицательное значение — размер в КиБ.
+    'cache_size': -64000,
+    'mmap_size': 256 * 1024 * 1024,
+    'temp_store': 'memory',
+}
+# Повторы запросов на запись при блокировке; пауза удваивается с каждым
+# повтором, секунды.
+DB_LOCKED_RETRIES = 5
+DB_LOCKED_RETRY_DELAY = 0.05
+
+# Реплики для чтения: псевдонимы из DATABASES (см. blogicum.routers).
+# Пустой список — все запросы идут в default.
+DATABASE_REPLICAS = []
+DATABASE_ROUTERS = ['blogicum.routers.PrimaryReplicaRouter']
+# Сколько секунд после записи пользователь читает с основной БД
+REPLICA_PIN_SECONDS = 10
+
+
+# Cache
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'blogicum',
+        'OPTIONS': {
+            'MAX_ENTRIES': 5000,
+        },
+    },
+}
+
+# Кэш страниц для неавторизованных пользователей
+PAGE_CACHE_ALIAS = 'default'
+PAGE_CACHE_TIMEOUT = 600
+
+
+# Сессии читаются из кэша, в БД они пишутся при изменении
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+# Пользователь сессии читается из кэша (см. blog.auth). ModelBackend
+# оставлен для сессий, созданных до включения кэша.
+AUTHENTICATION_BACKENDS = [
+    'blog.auth.CachedModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+USER_CACHE_ALIAS = 'default'
+USER_CACHE_TIMEOUT = 300
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
@@ -133,3 +221,14 @@ STATIC_URL = '/static/'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 MEDIA_ROOT = BASE_DIR / 'media'
+MEDIA_URL = '/media/'
+
+# Изображения публикаций отдаёт blog.media.serve_post_image. Оригиналы с
+# именем по хэшу содержимого не меняются и кэшируются клиентами без
+# ограничений, остальные файлы, в том числе уменьшенные копии, — на
+# MEDIA_CACHE_MAX_AGE секунд.
+MEDIA_CACHE_MAX_AGE = 24 * 60 * 60
+# Передача файла прокси-серверу: None, 'x-accel-redirect' (nginx, внутренний
+# location MEDIA_ACCEL_REDIRECT_PREFIX) или 'x-sendfile' (Apache, lighttpd).
+MEDIA_SENDFILE = None
+MEDIA_ACCEL_REDIRECT_PREFIX = '/protected-media/'
@@ -0,0 +1,36 @@
+"""Настройки для боевого окружения.
+
+Подключаются через DJANGO_SETTINGS_MODULE=blogicum.settings_production.
+Шаблоны разбираются один раз и хранятся в памяти процесса (cached loader),
+а при старте WSGI-приложения компилируются заранее командой warm_templates.
+Параметры БД, постоянные соединения и пул задаются переменными окружения
+(см. blogicum.database).
+"""
+import os
+from copy import deepcopy
+
+from .settings import *  # noqa: F401,F403
+from .database import database_settings
+from .settings import DATABASES, SECRET_KEY, TEMPLATES
+
+DEBUG = False
+
+SECRET_KEY = os.environ.get('DJANGO_SECRET_KEY', SECRET_KEY)
+
+ALLOWED_HOSTS = os.environ.get('DJANGO_ALLOWED_HOSTS', '*').split(',')
+
+DATABASES, DATABASE_REPLICAS = database_settings(
+    os.environ, DATABASES['default']
+)
+
+TEMPLATES = deepcopy(TEMPLATES)
+TEMPLATES[0]['APP_DIRS'] = False
+TEMPLATES[0]['OPTIONS']['loaders'] = [
+    ('django.template.loaders.cached.Loader', [
+        'django.template.loaders.filesystem.Loader',
+        'django.template.loaders.app_directories.Loader',
+    ]),
+]
+
+# Компилировать шаблоны при старте WSGI-приложения
+WARM_TEMPLATES_ON_STARTUP = True
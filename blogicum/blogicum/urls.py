@@ -2,17 +2,25 @@
 Добавила пути для встроенных стр авторизации, регистрации, изменения пароля.
 """
 
+from django.conf import settings
 from django.contrib import admin
 from django.contrib.auth.forms import UserCreationForm
 from django.views.generic.edit import CreateView
 from django.urls import include, path, reverse_lazy
 
+from blog.media import serve_post_image
+
 
 handler404 = 'pages.views.page_not_found'
 handler500 = 'pages.views.server_error'
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path(
+        f'{settings.MEDIA_URL.lstrip("/")}post_images/<path:name>',
+        serve_post_image,
+        name='post_image',
+    ),
     path("pages/", include('pages.urls')),
     path('', include('blog.urls')),
     path('auth/', include('django.contrib.auth.urls')),
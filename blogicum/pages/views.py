@@ -5,14 +5,16 @@
 from django.shortcuts import render
 from django.views.generic import TemplateView
 
+from blog.page_cache import AnonymousPageCacheMixin
 
-class About(TemplateView):
+
+class About(AnonymousPageCacheMixin, TemplateView):
     """view-класс для страницы about"""
 
     template_name = 'pages/about.html'
 
 
-class Rules(TemplateView):
+class Rules(AnonymousPageCacheMixin, TemplateView):
     """view-класс для страницы rules"""
 
     template_name = 'pages/rules.html'
@@ -19,6 +19,7 @@ from typing import (
 import pytest
 from django.apps import apps
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.db.models import Model, Field
 from django.forms import BaseForm
 from django.http import HttpResponse
@@ -41,6 +42,19 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(autouse=True)
+def image_jobs_in_db_only():
+    # Тесты выполняют задания обработки изображений явно.
+    with override_settings(IMAGE_JOBS_IN_PROCESS=False):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
@@ -92,6 +106,8 @@ pytest_plugins = [
     "fixtures.locations",
     "fixtures.categories",
     "fixtures.comments",
+    "fixtures.images",
+    "fixtures.databases",
     "adapters.comment",
 ]
 
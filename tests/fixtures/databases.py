@@ -0,0 +1,19 @@
+import pytest
+
+
+@pytest.fixture(scope="session")
+def django_db_modify_db_settings(
+        django_db_modify_db_settings_parallel_suffix, tmp_path_factory
+):
+    """Основная БД и реплика — отдельные файлы SQLite."""
+    from django.conf import settings
+    from django.db import connections
+
+    directory = tmp_path_factory.mktemp("databases")
+    primary = settings.DATABASES["default"]
+    primary.setdefault("TEST", {})["NAME"] = directory / "primary.sqlite3"
+    settings.DATABASES["replica"] = {
+        **primary,
+        "TEST": {"NAME": directory / "replica.sqlite3"},
+    }
+    connections.configure_settings(settings.DATABASES)
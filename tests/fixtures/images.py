@@ -0,0 +1,24 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+
+
+def make_image(width=50, height=50, color=(73, 109, 137), name="photo.jpg"):
+    buffer = BytesIO()
+    Image.new("RGB", (width, height), color=color).save(
+        buffer, format="JPEG"
+    )
+    return SimpleUploadedFile(name, buffer.getvalue())
+
+
+@pytest.fixture
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+@pytest.fixture
+def image_post(make_post, media_root):
+    return make_post(image=make_image(2000, 1000))
@@ -21,6 +21,27 @@ from conftest import (
 )
 
 
+@pytest.fixture
+def make_post(mixer: Mixer, user, published_category, published_location):
+    def make(**kwargs):
+        return mixer.blend(
+            "blog.Post",
+            **{
+                "is_published": True,
+                "author": user,
+                "category": published_category,
+                "location": published_location,
+                **kwargs,
+            },
+        )
+    return make
+
+
+@pytest.fixture
+def post(make_post):
+    return make_post()
+
+
 @pytest.fixture
 def posts_with_unpublished_category(mixer: Mixer, user: Model):
     return mixer.cycle(N_PER_FIXTURE).blend(
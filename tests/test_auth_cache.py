@@ -0,0 +1,90 @@
+import pytest
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+UNCACHED = {
+    "SESSION_ENGINE": "django.contrib.sessions.backends.db",
+    "AUTHENTICATION_BACKENDS": ["django.contrib.auth.backends.ModelBackend"],
+}
+
+
+def request_queries(client, url):
+    client.get(url)
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200
+    return [query["sql"] for query in context.captured_queries]
+
+
+def touches(queries, table):
+    return [sql for sql in queries if f'"{table}"' in sql]
+
+
+@pytest.mark.django_db
+def test_authenticated_request_skips_session_and_user_queries(
+        user, settings
+):
+    url = reverse("blog:edit_profile")
+    client = Client()
+    client.force_login(user)
+    cached = request_queries(client, url)
+    assert not touches(cached, "django_session"), (
+        "Убедитесь, что сессия авторизованного пользователя читается "
+        "из кэша, а не из таблицы django_session."
+    )
+    assert not touches(cached, "auth_user"), (
+        "Убедитесь, что пользователь сессии читается из кэша, "
+        "а не из таблицы auth_user."
+    )
+
+    for name, value in UNCACHED.items():
+        setattr(settings, name, value)
+    client = Client()
+    client.force_login(user)
+    uncached = request_queries(client, url)
+    assert len(uncached) - len(cached) >= 2, (
+        "Убедитесь, что кэш сессий и пользователя убирает из каждого "
+        "авторизованного запроса не меньше двух запросов к БД."
+    )
+
+
+@pytest.mark.django_db
+def test_profile_update_invalidates_cached_user(user_client, user):
+    url = reverse("blog:edit_profile")
+    user_client.get(url)
+    response = user_client.post(url, {
+        "first_name": "Новое имя",
+        "last_name": user.last_name,
+        "email": "new@example.com",
+        "username": user.username,
+    })
+    assert response.status_code == 302
+    response = user_client.get(url)
+    assert response.context["user"].first_name == "Новое имя", (
+        "Убедитесь, что после изменения профиля пользователь сессии "
+        "не берётся из кэша со старыми данными."
+    )
+
+
+@pytest.mark.django_db
+def test_password_change_logs_out_other_sessions(user):
+    user.set_password("old-Passw0rd")
+    user.save()
+    url = reverse("blog:edit_profile")
+    current, other = Client(), Client()
+    for client in (current, other):
+        client.login(username=user.username, password="old-Passw0rd")
+        assert client.get(url).status_code == 200
+    response = current.post(reverse("password_change"), {
+        "old_password": "old-Passw0rd",
+        "new_password1": "new-Passw0rd-42",
+        "new_password2": "new-Passw0rd-42",
+    })
+    assert response.status_code == 302
+    assert current.get(url).status_code == 200
+    assert other.get(url).status_code == 302, (
+        "Убедитесь, что после смены пароля остальные сессии пользователя "
+        "завершаются, несмотря на кэш пользователя."
+    )
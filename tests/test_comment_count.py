@@ -0,0 +1,78 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def stored_count(post):
+    post.refresh_from_db(fields=["comment_count"])
+    return post.comment_count
+
+
+def test_new_post_has_no_comments(post):
+    assert stored_count(post) == 0
+
+
+def test_comment_views_update_counter(user_client, post):
+    user_client.post(
+        f"/posts/{post.id}/comment/", data={"text": "Новый комментарий"}
+    )
+    assert stored_count(post) == 1, (
+        "Убедитесь, что добавление комментария увеличивает счётчик"
+        " комментариев публикации."
+    )
+    comment = post.comments.get()
+    user_client.post(f"/posts/{post.id}/delete_comment/{comment.id}/")
+    assert stored_count(post) == 0, (
+        "Убедитесь, что удаление комментария уменьшает счётчик комментариев"
+        " публикации."
+    )
+
+
+def test_moved_comment_updates_both_posts(mixer, post):
+    other_post = mixer.blend("blog.Post", author=post.author)
+    comment = mixer.blend("blog.Comment", post=post)
+    comment.post = other_post
+    comment.save()
+    assert (stored_count(post), stored_count(other_post)) == (0, 1), (
+        "Убедитесь, что перенос комментария в другую публикацию меняет"
+        " счётчики обеих публикаций."
+    )
+
+
+def test_stale_post_instance_keeps_counter(mixer, post):
+    mixer.blend("blog.Comment", post=post)
+    post.title = "Новый заголовок"
+    post.save()
+    assert stored_count(post) == 1, (
+        "Убедитесь, что сохранение публикации не перезаписывает счётчик"
+        " комментариев устаревшим значением."
+    )
+
+
+def test_feed_reads_counter_column(user_client, mixer, post):
+    mixer.cycle(3).blend("blog.Comment", post=post)
+    with CaptureQueriesContext(connection) as context:
+        content = user_client.get("/").content.decode()
+    assert "Комментарии (3)" in content
+    assert not any(
+        'FROM "blog_comment"' in query["sql"]
+        for query in context.captured_queries
+    ), (
+        "Убедитесь, что лента берёт число комментариев из поля публикации,"
+        " а не считает комментарии."
+    )
+
+
+def test_recount_comments_repairs_counters(mixer, post):
+    mixer.cycle(2).blend("blog.Comment", post=post)
+    type(post).objects.filter(pk=post.pk).update(comment_count=7)
+    call_command("recount_comments", "--dry-run")
+    assert stored_count(post) == 7
+    call_command("recount_comments")
+    assert stored_count(post) == 2, (
+        "Убедитесь, что команда recount_comments исправляет счётчики"
+        " комментариев."
+    )
@@ -0,0 +1,98 @@
+import re
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.views import PAGINATOR_COMMENTS
+
+pytestmark = [pytest.mark.django_db]
+
+
+def blend_comments(mixer, post, n):
+    return mixer.cycle(n).blend(
+        "blog.Comment", post=post, text=mixer.sequence("Комментарий №{0}.")
+    )
+
+
+def get_comments(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200, (
+        f"Убедитесь, что страница `{url}` загружается без ошибок."
+    )
+    content = response.content.decode()
+    next_url = re.search(r'data-comments-url="([^"]+)"', content)
+    return (
+        re.findall(r"Комментарий №\d+\.", content),
+        next_url and next_url.group(1).replace("&amp;", "&"),
+        context.captured_queries,
+        content,
+    )
+
+
+def test_detail_renders_first_comments_page(user_client, mixer, post):
+    comments = blend_comments(mixer, post, PAGINATOR_COMMENTS + 1)
+    shown, next_url, _, _ = get_comments(
+        user_client, f"/posts/{post.id}/"
+    )
+    assert shown == [comment.text for comment in comments][
+        :PAGINATOR_COMMENTS
+    ], (
+        "Убедитесь, что на странице публикации выводится только первая"
+        " страница комментариев в порядке их добавления."
+    )
+    assert next_url, (
+        "Убедитесь, что под комментариями есть ссылка на загрузку"
+        " следующей страницы."
+    )
+
+
+def test_comment_pages_cover_all_comments(user_client, mixer, post):
+    comments = blend_comments(mixer, post, PAGINATOR_COMMENTS * 2 + 1)
+    shown, next_url, _, _ = get_comments(
+        user_client, f"/posts/{post.id}/"
+    )
+    while next_url:
+        page, next_url, _, content = get_comments(user_client, next_url)
+        assert "<form" not in content, (
+            "Убедитесь, что следующие страницы комментариев отдаются без"
+            " формы комментария и остальной страницы."
+        )
+        shown += page
+    assert shown == [comment.text for comment in comments], (
+        "Убедитесь, что подгрузка страниц комментариев выводит каждый"
+        " комментарий ровно один раз."
+    )
+
+
+def test_detail_cost_does_not_depend_on_comments(user_client, mixer, post):
+    url = f"/posts/{post.id}/"
+    blend_comments(mixer, post, 2)
+    _, _, few, _ = get_comments(user_client, url)
+    blend_comments(mixer, post, PAGINATOR_COMMENTS * 5)
+    shown, _, many, _ = get_comments(user_client, url)
+    assert len(shown) == PAGINATOR_COMMENTS
+    assert len(many) == len(few), (
+        "Убедитесь, что число запросов на странице публикации не зависит"
+        " от числа комментариев."
+    )
+    for query in many:
+        sql = query["sql"].upper()
+        assert "OFFSET" not in sql and "COUNT(" not in sql
+
+
+def test_comments_of_hidden_post(client, mixer, post):
+    post.is_published = False
+    post.save()
+    blend_comments(mixer, post, 1)
+    response = client.get(f"/posts/{post.id}/comments/")
+    assert response.status_code == 404, (
+        "Убедитесь, что комментарии скрытой публикации недоступны другим"
+        " пользователям."
+    )
+
+
+def test_invalid_comments_cursor(client, post):
+    response = client.get(f"/posts/{post.id}/comments/?cursor=bad")
+    assert response.status_code == 404
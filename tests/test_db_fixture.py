@@ -0,0 +1,33 @@
+from pathlib import Path
+
+import pytest
+from django.core.management import call_command
+
+from blog.models import Post
+
+FIXTURE = Path(__file__).resolve().parent.parent / "blogicum" / "db.json"
+
+
+@pytest.mark.django_db
+def test_demo_fixture_loads():
+    call_command("loaddata", FIXTURE, verbosity=0)
+    posts = list(Post.objects.all())
+    assert posts, (
+        "Убедитесь, что фикстура db.json загружается командой loaddata."
+    )
+    for post in posts:
+        assert post.updated_at is not None, (
+            "Убедитесь, что у публикаций в db.json задано время изменения."
+        )
+        assert post.comment_count == post.comments.count(), (
+            "Убедитесь, что число комментариев публикаций в db.json"
+            " совпадает с их комментариями."
+        )
+        assert post.is_visible == (
+            post.is_published
+            and post.is_pub_date_reached()
+            and post.is_category_published()
+        ), (
+            "Убедитесь, что флаг is_visible публикаций в db.json"
+            " соответствует их публикации, категории и дате."
+        )
@@ -0,0 +1,214 @@
+import threading
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.db import OperationalError
+from django.db.utils import load_backend
+
+from blog import db
+from blogicum.backends import pool
+from blogicum.database import database_settings
+
+DEFAULT = {"ENGINE": "django.db.backends.sqlite3", "NAME": "db.sqlite3"}
+
+
+class FakeConnection:
+    def __init__(self, usable=True):
+        self.usable = usable
+        self.closed = False
+
+    def cursor(self):
+        if not self.usable:
+            raise OSError("server closed the connection")
+        return self
+
+    def execute(self, sql):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+def test_pool_reuses_connections():
+    connections_pool = pool.ConnectionPool(FakeConnection, max_size=2)
+    first, reused = connections_pool.acquire()
+    assert not reused
+    connections_pool.release(first)
+    again, reused = connections_pool.acquire()
+    assert again is first and reused, (
+        "Убедитесь, что пул отдаёт возвращённое соединение повторно, "
+        "а не открывает новое."
+    )
+    assert connections_pool.stats()["connects"] == 1
+
+
+def test_pool_limits_size_and_counts_waits():
+    connections_pool = pool.ConnectionPool(
+        FakeConnection, max_size=1, timeout=0.05
+    )
+    connection, _ = connections_pool.acquire()
+    with pytest.raises(OperationalError):
+        connections_pool.acquire()
+    stats = connections_pool.stats()
+    assert stats["size"] == 1 and stats["timeouts"] == 1, (
+        "Убедитесь, что пул не открывает соединений сверх MAX_SIZE "
+        "и после TIMEOUT ожидания выбрасывает OperationalError."
+    )
+
+    connections_pool.timeout = 5
+    timer = threading.Timer(
+        0.05, connections_pool.release, args=(connection,)
+    )
+    timer.start()
+    assert connections_pool.acquire() == (connection, True)
+    timer.join()
+    stats = connections_pool.stats()
+    assert stats["waits"] == 1 and stats["max_wait"] > 0, (
+        "Убедитесь, что пул учитывает число и время ожиданий соединения."
+    )
+
+
+def test_pool_health_checks_discard_broken_connections():
+    connections_pool = pool.ConnectionPool(
+        FakeConnection, max_size=1, health_checks=True
+    )
+    broken, _ = connections_pool.acquire()
+    broken.usable = False
+    connections_pool.release(broken)
+    connection, reused = connections_pool.acquire()
+    assert connection is not broken and not reused, (
+        "Убедитесь, что разорванное соединение из пула заменяется новым."
+    )
+    assert broken.closed
+    assert connections_pool.stats()["discarded"] == 1
+
+
+@pytest.fixture
+def pooled_settings(tmp_path, django_db_blocker):
+    alias = "pool_test"
+    settings_dict = {
+        "ENGINE": "blogicum.backends.sqlite3",
+        "NAME": str(tmp_path / "pool.sqlite3"),
+        "ATOMIC_REQUESTS": False,
+        "AUTOCOMMIT": True,
+        "CONN_MAX_AGE": 0,
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {},
+        "TIME_ZONE": None,
+        "USER": "",
+        "PASSWORD": "",
+        "HOST": "",
+        "PORT": "",
+        "TEST": {},
+        "POOL": {"MAX_SIZE": 1, "TIMEOUT": 0.05},
+    }
+    # Отдельная БД в файле, а не тестовая БД pytest-django.
+    with django_db_blocker.unblock():
+        yield alias, settings_dict
+    connections_pool = pool.pools.pop(alias, None)
+    if connections_pool is not None:
+        connections_pool.close_idle()
+
+
+def test_pooled_backend_returns_connection_to_pool(pooled_settings):
+    alias, settings_dict = pooled_settings
+    backend = load_backend(settings_dict["ENGINE"])
+    first = backend.DatabaseWrapper(settings_dict, alias)
+    second = backend.DatabaseWrapper(settings_dict, alias)
+    with first.cursor() as cursor:
+        cursor.execute("CREATE TABLE pooled (id integer)")
+    raw_connection = first.connection
+    with pytest.raises(OperationalError):
+        second.ensure_connection()
+    first.close()
+    assert second.cursor().execute("SELECT COUNT(*) FROM pooled")
+    assert second.connection is raw_connection and second.connection_reused, (
+        "Убедитесь, что закрытое соединение бэкенда с пулом возвращается "
+        "в пул и используется повторно."
+    )
+    second.close()
+    assert pool.pool_stats()[alias]["in_use"] == 0
+
+
+def test_database_settings_from_environment():
+    databases, replicas = database_settings({}, DEFAULT)
+    assert databases["default"]["CONN_MAX_AGE"] == 60, (
+        "Убедитесь, что по умолчанию соединения с БД постоянные."
+    )
+    assert replicas == []
+
+    databases, replicas = database_settings({
+        "DB_ENGINE": "postgresql",
+        "DB_NAME": "blogicum",
+        "DB_HOST": "db",
+        "DB_PORT": "5432",
+        "DB_CONN_MAX_AGE": "none",
+        "DB_CONN_HEALTH_CHECKS": "true",
+        "DB_REPLICA_HOSTS": "replica-a,replica-b:6432",
+    }, DEFAULT)
+    primary = databases["default"]
+    assert primary["ENGINE"] == "django.db.backends.postgresql"
+    assert primary["NAME"] == "blogicum" and primary["HOST"] == "db"
+    assert primary["CONN_MAX_AGE"] is None
+    assert primary["CONN_HEALTH_CHECKS"] is True
+    assert replicas == ["replica_1", "replica_2"]
+    assert databases["replica_1"]["HOST"] == "replica-a"
+    assert databases["replica_1"]["PORT"] == "5432"
+    assert databases["replica_2"]["PORT"] == "6432", (
+        "Убедитесь, что DB_REPLICA_HOSTS добавляет реплики в DATABASES."
+    )
+
+
+def test_database_settings_pool():
+    databases, _ = database_settings({
+        "DB_ENGINE": "postgresql",
+        "DB_POOL": "1",
+        "DB_POOL_MAX_SIZE": "10",
+    }, DEFAULT)
+    primary = databases["default"]
+    assert primary["ENGINE"] == "blogicum.backends.postgresql", (
+        "Убедитесь, что DB_POOL включает бэкенд с пулом соединений."
+    )
+    assert primary["CONN_MAX_AGE"] == 0
+    assert primary["POOL"] == {"MAX_SIZE": 10, "TIMEOUT": 10}
+    with pytest.raises(ImproperlyConfigured):
+        database_settings(
+            {"DB_ENGINE": "django.db.backends.mysql", "DB_POOL": "1"},
+            DEFAULT
+        )
+    with pytest.raises(ImproperlyConfigured):
+        database_settings(
+            {"DB_POOL_MAX_SIZE": "many", "DB_POOL": "1"}, DEFAULT
+        )
+
+
+class FakeWrapper:
+    def __init__(self, health_checks, usable):
+        self.settings_dict = {"CONN_HEALTH_CHECKS": health_checks}
+        self.connection = object()
+        self.usable = usable
+
+    def is_usable(self):
+        return self.usable
+
+    def close(self):
+        self.connection = None
+
+
+def test_health_checks_close_broken_connections(monkeypatch):
+    broken = FakeWrapper(health_checks=True, usable=False)
+    healthy = FakeWrapper(health_checks=True, usable=True)
+    unchecked = FakeWrapper(health_checks=False, usable=False)
+
+    class Connections:
+        def all(self):
+            return [broken, healthy, unchecked]
+
+    monkeypatch.setattr(db, "connections", Connections())
+    db.check_connections(sender=None)
+    assert broken.connection is None, (
+        "Убедитесь, что при CONN_HEALTH_CHECKS разорванное соединение "
+        "закрывается в начале запроса."
+    )
+    assert healthy.connection is not None
+    assert unchecked.connection is not None
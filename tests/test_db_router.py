@@ -0,0 +1,87 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.db import router
+
+from blog.models import Category, Comment, Location, Post
+from blogicum.routers import PIN_COOKIE
+
+pytestmark = [pytest.mark.django_db(databases=["default", "replica"])]
+
+REPLICATED_MODELS = (get_user_model(), Session, Category, Location, Post,
+                     Comment)
+
+
+@pytest.fixture(autouse=True)
+def replica(settings):
+    settings.DATABASE_REPLICAS = ["replica"]
+    settings.REPLICA_PIN_SECONDS = 30
+
+
+def replicate():
+    """Копирование данных основной БД в реплику, как при репликации."""
+    for model in reversed(REPLICATED_MODELS):
+        model.objects.using("replica").all().delete()
+    for model in REPLICATED_MODELS:
+        model.objects.using("replica").bulk_create(
+            model.objects.using("default").all()
+        )
+
+
+def test_reads_go_to_replica(user_client, another_user_client, post):
+    url = f"/posts/{post.id}/"
+    assert another_user_client.get(url).status_code == 404, (
+        "Убедитесь, что страницы на чтение загружают данные из реплики."
+    )
+    replicate()
+    assert another_user_client.get(url).status_code == 200
+    assert user_client.get(url).status_code == 200
+
+
+def test_author_reads_own_writes(user_client, another_user_client, post):
+    replicate()
+    url = f"/posts/{post.id}/"
+    response = user_client.post(
+        f"{url}comment/", {"text": "Только что написанный комментарий"}
+    )
+    assert response.status_code == 302
+    assert response.cookies[PIN_COOKIE]["max-age"] == 30, (
+        "Убедитесь, что после записи пользователь закрепляется за основной"
+        " БД на REPLICA_PIN_SECONDS секунд."
+    )
+    assert "Только что написанный" in user_client.get(url).content.decode(), (
+        "Убедитесь, что после записи пользователь читает с основной БД и"
+        " сразу видит свой комментарий."
+    )
+    assert "Только что написанный" not in (
+        another_user_client.get(url).content.decode()
+    )
+    del user_client.cookies[PIN_COOKIE]
+    assert "Только что написанный" not in (
+        user_client.get(url).content.decode()
+    ), "Убедитесь, что по истечении закрепления чтение идёт с реплики."
+
+
+def test_unsafe_requests_use_primary(user_client, post):
+    replicate()
+    response = user_client.post(
+        f"/posts/{post.id}/edit/",
+        {
+            "title": "Изменённый заголовок",
+            "text": post.text,
+            "pub_date": post.pub_date.strftime("%Y-%m-%dT%H:%M"),
+            "category": post.category_id,
+            "location": post.location_id,
+        },
+    )
+    assert response.status_code == 302
+    assert Post.objects.get(pk=post.pk).title == "Изменённый заголовок"
+    assert Post.objects.using("replica").get(pk=post.pk).title == post.title
+
+
+def test_outside_requests_use_primary():
+    assert router.db_for_read(Post) == "default", (
+        "Убедитесь, что вне HTTP-запросов (команды, фоновые задания)"
+        " чтение идёт с основной БД."
+    )
+    assert router.db_for_write(Post) == "default"
@@ -0,0 +1,99 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def comment(mixer, user, post):
+    return mixer.blend("blog.Comment", post=post, author=user)
+
+
+EDIT_URLS = {
+    "edit_post": ("/posts/{post}/edit/", "blog_post"),
+    "delete_post": ("/posts/{post}/delete/", "blog_post"),
+    "edit_comment": (
+        "/posts/{post}/edit_comment/{comment}/", "blog_comment"
+    ),
+    "delete_comment": (
+        "/posts/{post}/delete_comment/{comment}/", "blog_comment"
+    ),
+}
+
+
+def table_queries(queries, table):
+    return [
+        query["sql"] for query in queries
+        if f'FROM "{table}"' in query["sql"]
+    ]
+
+
+@pytest.mark.parametrize("name", EDIT_URLS)
+@pytest.mark.parametrize(
+    "client_name, status", [("user_client", 200), ("another_user_client", 302)]
+)
+def test_edit_pages_fetch_object_once(
+        request, post, comment, name, client_name, status
+):
+    client = request.getfixturevalue(client_name)
+    url, table = EDIT_URLS[name]
+    url = url.format(post=post.id, comment=comment.id)
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == status
+    assert len(table_queries(context.captured_queries, table)) == 1, (
+        f"Убедитесь, что страница `{url}` получает объект из БД один раз."
+    )
+    # Пользователь сессии берётся из кэша.
+    assert not table_queries(context.captured_queries, "auth_user"), (
+        f"Убедитесь, что страница `{url}` проверяет автора по author_id,"
+        " не загружая автора из БД."
+    )
+
+
+def test_comment_of_another_post(user_client, mixer, comment):
+    other_post = mixer.blend("blog.Post", author=comment.author)
+    for url in (
+        f"/posts/{other_post.id}/edit_comment/{comment.id}/",
+        f"/posts/{other_post.id}/delete_comment/{comment.id}/",
+    ):
+        assert user_client.get(url).status_code == 404, (
+            "Убедитесь, что комментарий доступен для изменения только по"
+            " адресу его публикации."
+        )
+
+
+def test_comment_redirects_to_its_post(another_user_client, user_client,
+                                       mixer, post):
+    # id комментария не совпадает с id публикации.
+    mixer.cycle(2).blend("blog.Comment", post=post)
+    comment = mixer.blend("blog.Comment", post=post, author=post.author)
+    urls = (
+        f"/posts/{post.id}/edit_comment/{comment.id}/",
+        f"/posts/{post.id}/delete_comment/{comment.id}/",
+    )
+    for url in urls:
+        response = another_user_client.get(url)
+        assert response["Location"] == f"/posts/{post.id}/"
+    response = user_client.post(urls[1])
+    assert response["Location"] == f"/posts/{post.id}/", (
+        "Убедитесь, что после удаления комментария пользователь"
+        " перенаправляется на страницу его публикации."
+    )
+
+
+def test_post_delete_does_not_depend_on_comments(user_client, mixer, post):
+    def delete_queries(post):
+        with CaptureQueriesContext(connection) as context:
+            user_client.post(f"/posts/{post.id}/delete/")
+        return len(context.captured_queries)
+
+    mixer.blend("blog.Comment", post=post)
+    few = delete_queries(post)
+    other_post = mixer.blend("blog.Post", author=post.author)
+    mixer.cycle(10).blend("blog.Comment", post=other_post)
+    assert delete_queries(other_post) == few, (
+        "Убедитесь, что число запросов при удалении публикации не зависит"
+        " от числа её комментариев."
+    )
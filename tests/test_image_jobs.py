@@ -0,0 +1,113 @@
+import time
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+
+from blog.jobs import MAX_ATTEMPTS, run_pending_jobs
+from blog.models import ImageJob, Post
+from fixtures.images import make_image
+
+pytestmark = [pytest.mark.usefixtures("media_root")]
+
+
+@pytest.mark.django_db
+def test_upload_queues_job(
+        user_client, published_category, published_location
+):
+    response = user_client.post("/posts/create/", data={
+        "title": "Заголовок",
+        "text": "Текст",
+        "pub_date": timezone.now().strftime("%Y-%m-%dT%H:%M"),
+        "category": published_category.id,
+        "location": published_location.id,
+        "image": make_image(2000, 1000),
+    })
+    assert response.status_code == 302
+    post = Post.objects.get()
+    assert not post.renditions_ready
+    assert list(post.image_jobs.values_list("status", flat=True)) == [
+        ImageJob.PENDING
+    ], (
+        "Убедитесь, что загрузка изображения ставит задание на создание"
+        " копий в очередь, а не создаёт их во время запроса."
+    )
+    call_command("process_image_jobs")
+    post.refresh_from_db()
+    assert post.renditions_ready and post.card_image.url.endswith(
+        ".card.jpg"
+    ), "Убедитесь, что команда process_image_jobs выполняет задания."
+    assert post.image_jobs.get().status == ImageJob.DONE
+
+
+@pytest.mark.django_db
+def test_resave_does_not_duplicate_job(image_post):
+    image_post.title = "Новый заголовок"
+    image_post.save()
+    assert image_post.image_jobs.count() == 1
+
+
+@pytest.mark.django_db
+def test_broken_image_is_retried(make_post):
+    post = make_post(
+        image=SimpleUploadedFile("broken.jpg", b"not an image")
+    )
+    for _ in range(MAX_ATTEMPTS):
+        assert post.image_jobs.get().status == ImageJob.PENDING
+        run_pending_jobs()
+    job = post.image_jobs.get()
+    assert (job.status, job.attempts) == (ImageJob.FAILED, MAX_ATTEMPTS), (
+        "Убедитесь, что неудачное задание повторяется ограниченное число"
+        " раз."
+    )
+    assert job.error
+
+
+@pytest.mark.django_db
+def test_failed_image_is_not_requeued(image_post):
+    image_post.image_jobs.update(
+        status=ImageJob.FAILED, attempts=MAX_ATTEMPTS
+    )
+    image_post.title = "Новый заголовок"
+    image_post.save()
+    assert list(image_post.image_jobs.values_list("status", flat=True)) == [
+        ImageJob.FAILED
+    ], (
+        "Убедитесь, что сохранение публикации не ставит в очередь"
+        " изображение, обработка которого завершилась ошибкой."
+    )
+    image_post.image = make_image(name="new_photo.jpg")
+    image_post.save()
+    assert image_post.image_jobs.filter(
+        status=ImageJob.PENDING, image=image_post.image.name
+    ).exists(), (
+        "Убедитесь, что новое изображение публикации ставится в очередь."
+    )
+
+
+@pytest.mark.django_db
+def test_stale_running_job_is_requeued(image_post):
+    image_post.image_jobs.update(
+        status=ImageJob.RUNNING,
+        started_at=timezone.now() - timezone.timedelta(hours=1),
+    )
+    call_command("process_image_jobs")
+    assert image_post.image_jobs.get().status == ImageJob.DONE
+
+
+@pytest.mark.django_db(transaction=True)
+def test_in_process_pool_runs_job_after_commit(make_post):
+    with override_settings(IMAGE_JOBS_IN_PROCESS=True):
+        post = make_post(image=make_image(2000, 1000))
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            post.refresh_from_db()
+            if post.renditions_ready:
+                break
+            time.sleep(0.05)
+    assert post.renditions_ready, (
+        "Убедитесь, что задание выполняется пулом потоков после коммита"
+        " транзакции."
+    )
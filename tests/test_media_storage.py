@@ -0,0 +1,79 @@
+import hashlib
+import re
+from io import BytesIO
+
+import pytest
+from django.core.files.base import File
+from django.core.management import call_command
+
+from blog.jobs import run_pending_jobs
+from blog.storage import HASH_CHUNK_SIZE, content_hash
+from fixtures.images import make_image
+
+pytestmark = [pytest.mark.django_db, pytest.mark.usefixtures("media_root")]
+
+
+def post_with_image(make_post, color, name="photo.JPG"):
+    return make_post(image=make_image(color=color, name=name))
+
+
+def stored_files(media_root):
+    return sorted(
+        path.relative_to(media_root).as_posix()
+        for path in media_root.rglob("*") if path.is_file()
+    )
+
+
+def test_identical_uploads_share_file(make_post, media_root):
+    first = post_with_image(make_post, "red", name="first.jpg")
+    second = post_with_image(make_post, "red", name="second.jpg")
+    other = post_with_image(make_post, "blue")
+    assert first.image.name == second.image.name, (
+        "Убедитесь, что одинаковые изображения хранятся в одном файле."
+    )
+    assert other.image.name != first.image.name
+    assert re.fullmatch(
+        r"post_images/([0-9a-f]{2})/([0-9a-f]{2})/\1\2[0-9a-f]{60}\.jpg",
+        first.image.name,
+    ), (
+        "Убедитесь, что изображение сохраняется под именем по хэшу"
+        " содержимого в каталогах по первым символам хэша."
+    )
+    assert len(stored_files(media_root)) == 2
+
+
+def test_content_hash_reads_in_chunks():
+    data = bytes(range(256)) * (HASH_CHUNK_SIZE // 64)
+    assert content_hash(File(BytesIO(data))) == (
+        hashlib.sha256(data).hexdigest()
+    )
+
+
+def test_garbage_collection(make_post, media_root):
+    kept = post_with_image(make_post, "red")
+    shared = post_with_image(make_post, "red")
+    removed = post_with_image(make_post, "green")
+    run_pending_jobs()
+    files_before = stored_files(media_root)
+    removed_files = [
+        name for name in files_before
+        if name.startswith(removed.image.name.rsplit(".", 1)[0])
+    ]
+    assert len(removed_files) == 5
+
+    shared.delete()
+    removed.delete()
+    call_command("collect_media_garbage", "--dry-run", "--grace=0")
+    call_command("collect_media_garbage")
+    assert stored_files(media_root) == files_before, (
+        "Убедитесь, что команда collect_media_garbage не удаляет файлы при"
+        " --dry-run и свежие файлы."
+    )
+    call_command("collect_media_garbage", "--grace=0")
+    assert stored_files(media_root) == sorted(
+        set(files_before) - set(removed_files)
+    ), (
+        "Убедитесь, что команда collect_media_garbage удаляет изображение"
+        " и его копии, только когда на него не ссылается ни одна публикация."
+    )
+    assert (media_root / kept.image.name).exists()
@@ -0,0 +1,138 @@
+import os
+
+import pytest
+
+from blog.renditions import generate_renditions, rendition_name
+
+pytestmark = [pytest.mark.django_db, pytest.mark.usefixtures("media_root")]
+
+
+@pytest.fixture
+def image_data(image_post):
+    with image_post.image.open("rb") as file:
+        return file.read()
+
+
+def get(client, post, **headers):
+    return client.get(post.image.url, **{
+        f"HTTP_{name.upper().replace('-', '_')}": value
+        for name, value in headers.items()
+    })
+
+
+def test_full_response(client, image_post, image_data):
+    response = get(client, image_post)
+    assert response.status_code == 200
+    assert b"".join(response.streaming_content) == image_data
+    assert response["Content-Type"] == "image/jpeg"
+    assert response["Accept-Ranges"] == "bytes"
+    assert response["ETag"] == (
+        f'"{image_post.image.name.rsplit("/", 1)[1]}"'
+    ), "Убедитесь, что ETag изображения строится по хэшу его содержимого."
+    assert "immutable" in response["Cache-Control"]
+
+
+def test_rendition_is_revalidated(client, settings, image_post):
+    generate_renditions(image_post.image)
+    name = rendition_name(image_post.image.name, "card", "webp")
+    url = image_post.image.storage.url(name)
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response["Cache-Control"] == (
+        f"public, max-age={settings.MEDIA_CACHE_MAX_AGE}"
+    ), (
+        "Убедитесь, что уменьшенные копии, пересоздаваемые под тем же"
+        " именем, не отдаются с Cache-Control: immutable."
+    )
+    path = image_post.image.storage.path(name)
+    stat = os.stat(path)
+    assert response["ETag"] == (
+        f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+    ), "Убедитесь, что ETag копии строится по времени изменения и размеру."
+
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert client.get(
+        url, HTTP_IF_NONE_MATCH=response["ETag"]
+    ).status_code == 200, (
+        "Убедитесь, что после пересоздания копии прежний ETag не подходит."
+    )
+
+
+def test_not_modified(client, image_post):
+    response = get(client, image_post)
+    for headers in (
+        {"If-None-Match": response["ETag"]},
+        {"If-Modified-Since": response["Last-Modified"]},
+    ):
+        not_modified = get(client, image_post, **headers)
+        assert not_modified.status_code == 304, (
+            "Убедитесь, что на условный запрос неизменённого изображения"
+            " возвращается ответ 304."
+        )
+        assert not_modified["ETag"] == response["ETag"]
+        assert not not_modified.content
+    assert get(
+        client, image_post, **{"If-None-Match": '"other"'}
+    ).status_code == 200
+
+
+@pytest.mark.parametrize(
+    "header, start, end",
+    [("bytes=0-9", 0, 9), ("bytes=10-", 10, None), ("bytes=-5", -5, None)],
+)
+def test_partial_content(client, image_post, image_data, header, start, end):
+    response = get(client, image_post, Range=header)
+    assert response.status_code == 206, (
+        "Убедитесь, что на запрос части изображения возвращается ответ 206."
+    )
+    expected = image_data[start:None if end is None else end + 1]
+    assert b"".join(response.streaming_content) == expected
+    first = start % len(image_data)
+    assert response["Content-Range"] == (
+        f"bytes {first}-{first + len(expected) - 1}/{len(image_data)}"
+    )
+    assert int(response["Content-Length"]) == len(expected)
+
+
+def test_range_not_satisfiable(client, image_post, image_data):
+    response = get(client, image_post, Range=f"bytes={len(image_data)}-")
+    assert response.status_code == 416
+    assert response["Content-Range"] == f"bytes */{len(image_data)}"
+
+
+def test_if_range_mismatch_sends_whole_file(client, image_post):
+    response = get(client, image_post, Range="bytes=0-9", **{
+        "If-Range": '"stale"'
+    })
+    assert response.status_code == 200
+
+
+def test_proxy_offload(client, settings, image_post):
+    settings.MEDIA_SENDFILE = "x-accel-redirect"
+    response = get(client, image_post)
+    assert response.status_code == 200 and not response.content
+    assert response["X-Accel-Redirect"] == (
+        f"/protected-media/{image_post.image.name}"
+    ), "Убедитесь, что при MEDIA_SENDFILE файл отдаёт прокси-сервер."
+    assert "ETag" in response
+
+
+@pytest.mark.parametrize(
+    "path", ["../../blogicum/settings.py", "missing.jpg", ".tmp"]
+)
+def test_missing_or_forbidden_files(client, path):
+    assert client.get(f"/media/post_images/{path}").status_code == 404
+
+
+@pytest.mark.parametrize(
+    "name", ["../secret.txt", "aa/../../secret.txt", "../post_images2/x"]
+)
+def test_path_outside_post_images(client, media_root, name):
+    (media_root / "secret.txt").write_text("secret")
+    (media_root / "post_images2").mkdir()
+    (media_root / "post_images2" / "x").write_text("secret")
+    response = client.get(f"/media/post_images/{name}")
+    assert response.status_code == 404, (
+        "Убедитесь, что по адресу изображения публикации нельзя получить"
+        " файлы вне каталога post_images."
+    )
@@ -0,0 +1,155 @@
+import pytest
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.page_cache import page_cache_stats
+
+pytestmark = [pytest.mark.django_db]
+
+
+def get_cached(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    return response, len(context.captured_queries)
+
+
+@pytest.mark.parametrize(
+    "url", ["/", "/category/{category}/", "/posts/{post}/", "/pages/about/"]
+)
+def test_anonymous_pages_are_cached(client, post, url):
+    url = url.format(category=post.category.slug, post=post.id)
+    first, _ = get_cached(client, url)
+    second, queries = get_cached(client, url)
+    assert second["X-Page-Cache"] == "hit" and queries == 0, (
+        f"Убедитесь, что страница `{url}` для неавторизованных"
+        " пользователей отдаётся из кэша без запросов к БД."
+    )
+    assert second.content == first.content
+    assert page_cache_stats() == {"hits": 1, "misses": 1}
+
+
+def test_authenticated_pages_are_not_cached(user_client, post):
+    user_client.get("/")
+    response = user_client.get("/")
+    assert "X-Page-Cache" not in response, (
+        "Убедитесь, что страницы для авторизованных пользователей не"
+        " кэшируются."
+    )
+
+
+def test_page_number_is_part_of_key(client, mixer, post):
+    client.get("/")
+    response = client.get("/?page=1")
+    assert response["X-Page-Cache"] == "miss"
+
+
+def test_post_changes_invalidate_pages(client, mixer, post):
+    urls = ("/", f"/category/{post.category.slug}/", f"/posts/{post.id}/")
+    for url in urls:
+        client.get(url)
+    post.title = "Новый заголовок публикации"
+    post.save()
+    for url in urls:
+        response = client.get(url)
+        assert response["X-Page-Cache"] == "miss", (
+            "Убедитесь, что изменение публикации сбрасывает кэш страниц,"
+            " на которых она выводится."
+        )
+        assert post.title in response.content.decode()
+
+
+def test_pages_invalidated_again_after_commit(
+        client, post, django_capture_on_commit_callbacks
+):
+    url = f"/posts/{post.id}/"
+    with django_capture_on_commit_callbacks(execute=True):
+        post.title = "Новый заголовок публикации"
+        post.save()
+        # Параллельный запрос успел закэшировать страницу до коммита.
+        client.get(url)
+    assert client.get(url)["X-Page-Cache"] == "miss", (
+        "Убедитесь, что кэш страниц сбрасывается повторно после коммита"
+        " транзакции, изменившей публикацию."
+    )
+
+
+def test_unrelated_post_keeps_detail_page(client, mixer, post):
+    client.get(f"/posts/{post.id}/")
+    mixer.blend("blog.Post", is_published=True, category=post.category)
+    response = client.get(f"/posts/{post.id}/")
+    assert response["X-Page-Cache"] == "hit", (
+        "Убедитесь, что изменение одной публикации не сбрасывает кэш"
+        " страниц других публикаций."
+    )
+
+
+def test_comment_invalidates_post_and_feed(client, mixer, post):
+    client.get("/")
+    client.get(f"/posts/{post.id}/")
+    mixer.blend("blog.Comment", post=post, text="Новый комментарий")
+    assert "Новый комментарий" in client.get(
+        f"/posts/{post.id}/"
+    ).content.decode(), (
+        "Убедитесь, что новый комментарий сбрасывает кэш страницы публикации."
+    )
+    assert "Комментарии (1)" in client.get("/").content.decode(), (
+        "Убедитесь, что новый комментарий сбрасывает кэш ленты."
+    )
+
+
+def test_category_and_location_invalidate_post(client, post):
+    url = f"/posts/{post.id}/"
+    client.get(url)
+    post.location.name = "Новое место"
+    post.location.save()
+    assert "Новое место" in client.get(url).content.decode(), (
+        "Убедитесь, что изменение местоположения сбрасывает кэш страниц"
+        " публикаций."
+    )
+    post.category.is_published = False
+    post.category.save()
+    assert client.get(url).status_code == 404, (
+        "Убедитесь, что снятие категории с публикации сбрасывает кэш"
+        " страниц её публикаций."
+    )
+
+
+def card_cache_key(post):
+    post.refresh_from_db()
+    return make_template_fragment_key(
+        "post_card",
+        [post.id, post.updated_at.timestamp(), 0, post.author.username],
+    )
+
+
+def test_post_card_fragment_is_cached(user_client, post):
+    user_client.get("/")
+    assert cache.get(card_cache_key(post)) is not None, (
+        "Убедитесь, что карточка публикации кэшируется по id публикации и"
+        " времени её изменения."
+    )
+
+
+@pytest.mark.parametrize("related", ["location", "category"])
+def test_post_card_invalidated_by_related_changes(
+        user_client, post, related
+):
+    user_client.get(f"/profile/{post.author.username}/")
+    old_key = card_cache_key(post)
+    related_object = getattr(post, related)
+    related_object.is_published = False
+    related_object.save()
+    assert card_cache_key(post) != old_key
+    content = user_client.get(
+        f"/profile/{post.author.username}/"
+    ).content.decode()
+    expected = {
+        "location": "Планета Земля",
+        "category": "Выбранная категория снята с публикации админом",
+    }[related]
+    assert expected in content, (
+        "Убедитесь, что кэш карточки сбрасывается при изменении её"
+        " категории или местоположения."
+    )
@@ -0,0 +1,204 @@
+import pytest
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connection
+from django.template.loader import render_to_string
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.paginators import feed_count_cache_key
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def cursor_pagination():
+    with override_settings(FEED_CURSOR_PAGINATION=True):
+        yield
+
+
+@pytest.fixture
+def feed_posts(mixer, user, published_category, published_location):
+    # Половина публикаций с одинаковым временем, чтобы проверить
+    # разрешение равенства pub_date по id.
+    same_time = timezone.now() - timezone.timedelta(days=1)
+    return mixer.cycle(N_PER_PAGE * 3 + 1).blend(
+        "blog.Post",
+        is_published=True,
+        author=user,
+        category=published_category,
+        location=published_location,
+        pub_date=mixer.sequence(
+            lambda n: same_time if n % 2 else same_time - timezone.timedelta(
+                minutes=n
+            )
+        ),
+    )
+
+
+def get_page(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200, (
+        f"Убедитесь, что страница `{url}` загружается без ошибок."
+    )
+    return response.context["page_obj"], context.captured_queries
+
+
+def test_cursor_pages_cover_feed_in_order(
+        client, feed_posts, cursor_pagination
+):
+    expected = [
+        post.id for post in sorted(
+            feed_posts, key=lambda post: (post.pub_date, post.id),
+            reverse=True
+        )
+    ]
+    page, _ = get_page(client, "/")
+    pages = [page]
+    while page.has_next():
+        page, _ = get_page(client, f"/?cursor={page.next_cursor}")
+        pages.append(page)
+    assert [post.id for page in pages for post in page] == expected, (
+        "Убедитесь, что курсорная пагинация выводит каждую публикацию ленты"
+        " ровно один раз в порядке «от новых к старым»."
+    )
+
+    previous_pages = [page]
+    while page.has_previous():
+        page, _ = get_page(client, f"/?cursor={page.previous_cursor}")
+        previous_pages.append(page)
+    assert [
+        [post.id for post in page] for page in reversed(previous_pages)
+    ] == [[post.id for post in page] for page in pages], (
+        "Убедитесь, что переход по ссылкам «назад» возвращает те же страницы."
+    )
+
+
+def test_deep_cursor_page_cost_is_constant(
+        client, feed_posts, cursor_pagination
+):
+    page, first_queries = get_page(client, "/")
+    while page.has_next():
+        page, queries = get_page(client, f"/?cursor={page.next_cursor}")
+        assert len(queries) == len(first_queries), (
+            "Убедитесь, что число запросов на странице ленты не зависит от"
+            " её глубины."
+        )
+        for query in queries:
+            sql = query["sql"].upper()
+            assert "OFFSET" not in sql and "COUNT(*)" not in sql, (
+                "Убедитесь, что курсорная пагинация не использует OFFSET и"
+                " не считает общее число публикаций."
+            )
+
+
+def test_invalid_cursor(client, feed_posts, cursor_pagination):
+    response = client.get("/?cursor=not-a-cursor")
+    assert response.status_code == 404, (
+        "Убедитесь, что для неверного курсора возвращается ошибка 404."
+    )
+
+
+def count_queries_in(queries):
+    return sum("COUNT(*)" in query["sql"].upper() for query in queries)
+
+
+def test_feed_count_is_cached(user_client, feed_posts, published_category):
+    urls = ("/", f"/category/{published_category.slug}/")
+    for url in urls:
+        page, queries = get_page(user_client, url)
+        assert count_queries_in(queries) == 1
+        page, queries = get_page(user_client, url)
+        assert count_queries_in(queries) == 0, (
+            "Убедитесь, что число публикаций в ленте берётся из кэша при"
+            " повторном запросе."
+        )
+        assert page.paginator.count == len(feed_posts)
+
+
+def test_feed_count_invalidated_on_post_changes(
+        user_client, mixer, feed_posts, published_category
+):
+    client = user_client
+    url = f"/category/{published_category.slug}/?page=2"
+    get_page(client, url)
+    new_post = mixer.blend(
+        "blog.Post", is_published=True, category=published_category
+    )
+    page, _ = get_page(client, url)
+    assert page.paginator.count == len(feed_posts) + 1, (
+        "Убедитесь, что кэш числа публикаций сбрасывается при добавлении"
+        " публикации."
+    )
+
+    new_post.delete()
+    page, _ = get_page(client, url)
+    assert page.paginator.count == len(feed_posts), (
+        "Убедитесь, что кэш числа публикаций сбрасывается при удалении"
+        " публикации."
+    )
+
+    get_page(client, "/")
+    published_category.is_published = False
+    published_category.save()
+    page, _ = get_page(client, "/")
+    assert page.paginator.count == 0, (
+        "Убедитесь, что кэш числа публикаций сбрасывается при снятии"
+        " категории с публикации."
+    )
+
+
+def test_feed_count_invalidated_after_commit(
+        user_client, mixer, feed_posts, published_category,
+        django_capture_on_commit_callbacks
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        mixer.blend(
+            "blog.Post", is_published=True, category=published_category
+        )
+        # Параллельный запрос успел закэшировать число до коммита.
+        cache.set(feed_count_cache_key("index"), len(feed_posts))
+    page, _ = get_page(user_client, "/")
+    assert page.paginator.count == len(feed_posts) + 1, (
+        "Убедитесь, что кэш числа публикаций сбрасывается повторно после"
+        " коммита транзакции, изменившей публикацию."
+    )
+
+
+def test_feed_count_estimate_falls_back_to_cached_count(
+        user_client, feed_posts, settings
+):
+    settings.FEED_COUNT_ESTIMATE = True
+    settings.FEED_COUNT_ESTIMATE_MIN = 0
+    page, queries = get_page(user_client, "/")
+    assert not any("EXPLAIN" in query["sql"] for query in queries)
+    assert count_queries_in(queries) == 1
+    assert page.paginator.count == len(feed_posts), (
+        "Убедитесь, что при FEED_COUNT_ESTIMATE на SQLite пагинатор"
+        " считает публикации точно."
+    )
+    page, queries = get_page(user_client, "/")
+    assert count_queries_in(queries) == 0, (
+        "Убедитесь, что при FEED_COUNT_ESTIMATE на SQLite точное число"
+        " публикаций берётся из кэша."
+    )
+
+
+@pytest.mark.parametrize("number", [1, 2, 50_000, 99_999, 100_000])
+def test_paginator_renders_page_window(number):
+    paginator = Paginator(range(1_000_000), N_PER_PAGE)
+    html = render_to_string(
+        "includes/paginator.html", {"page_obj": paginator.page(number)}
+    )
+    assert html.count("<li") <= 15, (
+        "Убедитесь, что пагинатор выводит только страницы рядом с текущей,"
+        " а не все номера страниц ленты."
+    )
+    for shown in {1, number, paginator.num_pages}:
+        assert f">{shown}<" in html, (
+            "Убедитесь, что пагинатор выводит первую, последнюю и текущую"
+            " страницы."
+        )
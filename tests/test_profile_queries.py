@@ -0,0 +1,104 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+# (все запросы, запросы к auth_user): пользователь профиля (владельцу
+# берётся из сессии), число публикаций, страница публикаций. Сессия и
+# пользователь сессии читаются из кэша.
+PROFILE_QUERY_BUDGET = {
+    "client": (3, 1),
+    "user_client": (2, 0),
+    "another_user_client": (3, 1),
+}
+
+
+@pytest.fixture
+def profile_posts(mixer, user, published_category, published_location):
+    return mixer.cycle(N_PER_PAGE * 2).blend(
+        "blog.Post",
+        is_published=True,
+        author=user,
+        category=published_category,
+        location=published_location,
+    )
+
+
+def get_profile(client, user):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(f"/profile/{user.username}/")
+    assert response.status_code == 200
+    return response, [query["sql"] for query in context.captured_queries]
+
+
+@pytest.mark.parametrize("client_name", PROFILE_QUERY_BUDGET)
+def test_profile_query_budget(request, user, profile_posts, client_name):
+    client = request.getfixturevalue(client_name)
+    _, queries = get_profile(client, user)
+    budget, user_budget = PROFILE_QUERY_BUDGET[client_name]
+    assert len(queries) <= budget, (
+        f"Убедитесь, что страница профиля выполняет не больше {budget}"
+        " запросов к БД."
+    )
+    user_queries = [sql for sql in queries if 'FROM "auth_user"' in sql]
+    assert len(user_queries) == user_budget, (
+        "Убедитесь, что пользователь профиля загружается из БД один раз и"
+        " не подгружается для каждой публикации."
+    )
+
+
+def test_profile_hides_unpublished_from_others(
+        mixer, user, user_client, another_user_client, profile_posts
+):
+    hidden = [
+        mixer.blend("blog.Post", author=user, is_published=False),
+        mixer.blend(
+            "blog.Post", author=user, category=profile_posts[0].category,
+            pub_date=timezone.now() + timezone.timedelta(days=1),
+        ),
+    ]
+    own_page, _ = get_profile(user_client, user)
+    other_page, _ = get_profile(another_user_client, user)
+    assert own_page.context["paginator"].count == len(profile_posts) + 2, (
+        "Убедитесь, что автор видит в профиле все свои публикации."
+    )
+    assert other_page.context["paginator"].count == len(profile_posts), (
+        "Убедитесь, что другие пользователи не видят в профиле снятые с"
+        " публикации и отложенные публикации."
+    )
+    assert not {post.id for post in hidden} & {
+        post.id for post in other_page.context["page_obj"]
+    }
+
+
+@pytest.mark.parametrize("via_admin", [False, True])
+def test_profile_count_follows_category_publication(
+        admin_client, user, another_user_client, published_category,
+        another_category, make_post, via_admin
+):
+    for _ in range(N_PER_PAGE):
+        make_post(category=published_category)
+    kept = [make_post(category=another_category) for _ in range(5)]
+    page, _ = get_profile(another_user_client, user)
+    assert page.context["paginator"].count == N_PER_PAGE + len(kept)
+
+    if via_admin:
+        admin_client.post("/admin/blog/category/", {
+            "action": "unpublish",
+            "_selected_action": [published_category.id],
+        })
+    else:
+        published_category.is_published = False
+        published_category.save()
+    page, _ = get_profile(another_user_client, user)
+    assert page.context["paginator"].count == len(kept), (
+        "Убедитесь, что при снятии категории с публикации сбрасывается"
+        " закэшированное число публикаций в профилях её авторов."
+    )
+    assert {post.id for post in page.context["page_obj"]} == {
+        post.id for post in kept
+    }
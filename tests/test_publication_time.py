@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+import pytest
+from django.test import override_settings
+from django.utils import timezone
+
+from blog.models import Post
+from blog.scheduler import (
+    next_release_time, publication_time, publish_due_posts
+)
+
+pytestmark = [pytest.mark.django_db]
+
+BOUNDARY = datetime(2030, 1, 1, 12, 0, tzinfo=dt_timezone.utc)
+
+
+def test_publication_time_is_truncated():
+    now = BOUNDARY + timedelta(seconds=59, microseconds=500)
+    assert publication_time(now) == BOUNDARY, (
+        "Убедитесь, что время выпуска публикаций округляется вниз до"
+        " PUBLICATION_TIME_GRANULARITY."
+    )
+    assert publication_time(now).tzinfo is not None
+    assert timezone.is_aware(publication_time())
+
+
+@override_settings(PUBLICATION_TIME_GRANULARITY=3600)
+def test_granularity_is_configurable():
+    assert publication_time(BOUNDARY + timedelta(minutes=59)) == BOUNDARY
+
+
+def test_due_post_is_visible_at_once(make_post):
+    post = make_post(pub_date=timezone.now() - timedelta(seconds=1))
+    assert post.is_visible, (
+        "Убедитесь, что публикация, время которой уже наступило, видна"
+        " сразу, не дожидаясь границы шага планировщика."
+    )
+    assert next_release_time() is None
+
+
+def test_future_post_is_released_at_step_boundary(make_post):
+    pub_date = timezone.now() + timedelta(seconds=30)
+    post = make_post(pub_date=pub_date)
+    assert not post.is_visible
+    release = next_release_time()
+    assert release == publication_time(release), (
+        "Убедитесь, что планировщик выпускает отложенные публикации на"
+        " границе шага времени."
+    )
+    assert pub_date <= release < pub_date + timedelta(seconds=60)
+
+
+def test_publish_due_posts_crossing_boundary(make_post):
+    post = make_post(pub_date=BOUNDARY + timedelta(seconds=1))
+    assert publish_due_posts(BOUNDARY + timedelta(seconds=59)) == 0
+    assert not Post.objects.get(pk=post.pk).is_visible
+    assert next_release_time() == BOUNDARY + timedelta(seconds=60)
+    assert publish_due_posts(BOUNDARY + timedelta(seconds=60)) == 1, (
+        "Убедитесь, что отложенная публикация выходит на границе шага"
+        " времени."
+    )
+    assert Post.objects.get(pk=post.pk).is_visible
+
+
+def test_publish_due_posts_with_other_timezone(make_post):
+    post = make_post(pub_date=BOUNDARY)
+    moscow = dt_timezone(timedelta(hours=3))
+    assert publish_due_posts(BOUNDARY.astimezone(moscow)) == 1, (
+        "Убедитесь, что время сравнивается с учётом часового пояса."
+    )
+    assert Post.objects.get(pk=post.pk).is_visible
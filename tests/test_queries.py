@@ -0,0 +1,101 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import Mixer
+
+from conftest import N_PER_FIXTURE, N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+def count_queries(client, url: str) -> int:
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200, (
+        f"Убедитесь, что страница `{url}` загружается без ошибок."
+    )
+    return len(context.captured_queries)
+
+
+def blend_posts(mixer: Mixer, n: int, **kwargs):
+    return mixer.cycle(n).blend(
+        "blog.Post",
+        is_published=True,
+        location=mixer.blend("blog.Location", is_published=True),
+        **kwargs,
+    )
+
+
+@pytest.mark.parametrize("client_name", ["client", "user_client"])
+def test_feed_queries_do_not_depend_on_page_size(
+        request, mixer, user, published_category, client_name
+):
+    client = request.getfixturevalue(client_name)
+    urls = (
+        "/",
+        f"/category/{published_category.slug}/",
+        f"/profile/{user.username}/",
+    )
+    posts = blend_posts(
+        mixer, N_PER_FIXTURE, author=user, category=published_category
+    )
+    mixer.cycle(N_PER_FIXTURE).blend("blog.Comment", post=posts[0])
+    small_page = {url: count_queries(client, url) for url in urls}
+
+    blend_posts(mixer, N_PER_PAGE, author=user, category=published_category)
+    for url in urls:
+        assert count_queries(client, url) == small_page[url], (
+            f"Убедитесь, что число запросов к БД на странице `{url}` не"
+            " зависит от количества публикаций на ней."
+        )
+
+
+@pytest.mark.parametrize("client_name", ["client", "user_client"])
+def test_post_detail_fetches_single_row(
+        request, mixer, user, published_category, client_name
+):
+    client = request.getfixturevalue(client_name)
+    post, *_ = blend_posts(
+        mixer, N_PER_FIXTURE, author=user, category=published_category
+    )
+    url = f"/posts/{post.id}/"
+    cache.clear()
+    queries_before = count_queries(client, url)
+
+    blend_posts(mixer, N_PER_PAGE * 2, category=published_category)
+    cache.clear()
+    with CaptureQueriesContext(connection) as context:
+        client.get(url)
+    assert len(context.captured_queries) == queries_before, (
+        "Убедитесь, что число запросов к БД на странице публикации не"
+        " зависит от количества публикаций."
+    )
+    post_queries = [
+        query["sql"] for query in context.captured_queries
+        if 'FROM "blog_post"' in query["sql"]
+    ]
+    assert len(post_queries) == 1 and f'"blog_post"."id" = {post.id}' in (
+        post_queries[0]
+    ), (
+        "Убедитесь, что страница публикации получает из БД только"
+        " запрошенную публикацию одним запросом."
+    )
+
+
+def test_post_detail_visibility(
+        client, user_client, another_user_client, mixer, user
+):
+    post = mixer.blend(
+        "blog.Post", author=user, category__is_published=False
+    )
+    url = f"/posts/{post.id}/"
+    assert user_client.get(url).status_code == 200, (
+        "Убедитесь, что автор видит свою публикацию в снятой с публикации"
+        " категории."
+    )
+    for other_client in (client, another_user_client):
+        assert other_client.get(url).status_code == 404, (
+            "Убедитесь, что публикация в снятой с публикации категории не"
+            " видна другим пользователям."
+        )
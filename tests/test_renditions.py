@@ -0,0 +1,81 @@
+import pytest
+from bs4 import BeautifulSoup
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from PIL import Image
+
+from blog.jobs import run_pending_jobs
+from blog.renditions import RENDITION_WIDTHS, rendition_name
+from fixtures.images import make_image
+
+pytestmark = [pytest.mark.django_db, pytest.mark.usefixtures("media_root")]
+
+
+@pytest.fixture
+def image_post(image_post):
+    run_pending_jobs()
+    image_post.refresh_from_db()
+    return image_post
+
+
+def picture_of(client, url):
+    soup = BeautifulSoup(client.get(url).content.decode(), "html.parser")
+    return soup.find_all("picture")
+
+
+@pytest.mark.parametrize("size", RENDITION_WIDTHS)
+@pytest.mark.parametrize("extension", ["webp", "jpg"])
+def test_renditions_are_resized(image_post, size, extension):
+    name = rendition_name(image_post.image.name, size, extension)
+    with default_storage.open(name) as file:
+        rendition = Image.open(file)
+        rendition.load()
+    width = RENDITION_WIDTHS[size]
+    assert rendition.size == (width, width // 2), (
+        "Убедитесь, что для изображения публикации создаются уменьшенные"
+        " копии с сохранением пропорций."
+    )
+    assert rendition.format == {"webp": "WEBP", "jpg": "JPEG"}[extension]
+
+
+def test_small_image_is_not_upscaled(make_post):
+    post = make_post(image=make_image(100, 50))
+    assert post.card_image.width == 100 and post.card_image.height == 50
+
+
+@pytest.mark.parametrize(
+    "url, size",
+    [("/profile/{username}/", "card"), ("/posts/{post}/", "detail")],
+)
+def test_pages_use_renditions(user_client, image_post, url, size):
+    url = url.format(username=image_post.author.username, post=image_post.id)
+    picture, = picture_of(user_client, url)
+    image, = picture.find_all("img")
+    width = RENDITION_WIDTHS[size]
+    assert image["src"].endswith(f".{size}.jpg") and picture.source[
+        "srcset"
+    ].endswith(f".{size}.webp"), (
+        "Убедитесь, что в ленте и на странице публикации выводятся"
+        " уменьшенные копии изображения в форматах WebP и JPEG."
+    )
+    size_attrs = (image["width"], image["height"])
+    assert size_attrs == (str(width), str(width // 2)), (
+        "Убедитесь, что у изображения указаны атрибуты width и height."
+    )
+
+
+def test_original_is_shown_until_renditions_ready(user_client, image_post):
+    type(image_post).objects.filter(pk=image_post.pk).update(
+        image_meta={**image_post.image_meta, "renditions": False}
+    )
+    picture, = picture_of(user_client, f"/posts/{image_post.id}/")
+    assert picture.img["src"] == image_post.image.url
+    assert picture.source is None
+    call_command("generate_renditions")
+    image_post.refresh_from_db()
+    assert image_post.renditions_ready, (
+        "Убедитесь, что команда generate_renditions создаёт недостающие"
+        " копии изображений."
+    )
+    picture, = picture_of(user_client, f"/posts/{image_post.id}/")
+    assert picture.img["src"].endswith(".detail.jpg")
@@ -0,0 +1,84 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.scheduler import publish_due_posts
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def scheduled_post(make_post):
+    return make_post(pub_date=timezone.now() + timezone.timedelta(hours=1))
+
+
+def feed_ids(client, url):
+    response = client.get(url)
+    return [post.id for post in response.context["page_obj"]]
+
+
+def test_scheduled_post_goes_live(
+        user_client, another_user_client, scheduled_post
+):
+    urls = (
+        "/",
+        f"/category/{scheduled_post.category.slug}/",
+        f"/profile/{scheduled_post.author.username}/",
+    )
+    for url in urls:
+        assert scheduled_post.id not in feed_ids(another_user_client, url)
+    assert publish_due_posts() == 0
+
+    published = publish_due_posts(
+        timezone.now() + timezone.timedelta(hours=2)
+    )
+    assert published == 1
+    scheduled_post.refresh_from_db()
+    assert scheduled_post.is_visible
+    for url in urls:
+        assert scheduled_post.id in feed_ids(another_user_client, url), (
+            "Убедитесь, что после наступления времени публикации она"
+            " появляется в лентах, а кэш числа публикаций сброшен."
+        )
+
+
+def test_anonymous_pages_are_reset(client, scheduled_post):
+    url = f"/posts/{scheduled_post.id}/"
+    assert client.get(url).status_code == 404
+    client.get("/")
+    type(scheduled_post).objects.filter(pk=scheduled_post.pk).update(
+        pub_date=timezone.now() - timezone.timedelta(minutes=1)
+    )
+    call_command("publish_scheduled")
+    assert client.get(url).status_code == 200, (
+        "Убедитесь, что команда publish_scheduled сбрасывает кэш страниц"
+        " выпущенной публикации."
+    )
+    assert scheduled_post.title in client.get("/").content.decode()
+
+
+def test_rescheduled_post_is_hidden_again(another_user_client, mixer, user):
+    post = mixer.blend(
+        "blog.Post", author=user, is_published=True,
+        category__is_published=True,
+    )
+    post.pub_date = timezone.now() + timezone.timedelta(days=1)
+    post.save()
+    assert another_user_client.get(f"/posts/{post.id}/").status_code == 404
+
+
+def test_feed_query_does_not_depend_on_time(user_client, scheduled_post):
+    with CaptureQueriesContext(connection) as context:
+        user_client.get("/")
+    feed_sql = [
+        query["sql"] for query in context.captured_queries
+        if 'FROM "blog_post"' in query["sql"]
+    ]
+    assert feed_sql and not any(
+        '"blog_post"."pub_date" <=' in sql for sql in feed_sql
+    ), (
+        "Убедитесь, что запрос ленты не сравнивает дату публикации с"
+        " текущим временем."
+    )
@@ -0,0 +1,127 @@
+import pytest
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+
+from blog.views import PAGINATOR_SEARCH
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def make_post(make_post):
+    def make(title, text="Обычный текст", **kwargs):
+        return make_post(**{
+            "pub_date": timezone.now() - timezone.timedelta(days=1),
+            "title": title,
+            "text": text,
+            **kwargs,
+        })
+    return make
+
+
+def found(client, query, page=None):
+    params = {"q": query}
+    if page:
+        params["page"] = page
+    response = client.get("/search/", params)
+    assert response.status_code == 200, (
+        "Убедитесь, что страница поиска `/search/` загружается без ошибок."
+    )
+    return [post.id for post in response.context["page_obj"]]
+
+
+def test_search_finds_words_ranked(user_client, make_post):
+    in_text = make_post("Прогулка", "Видели ёжика в тумане")
+    in_title = make_post("Ёжик в лесу")
+    make_post("Про котов")
+    assert found(user_client, "ЕЖИК") == [in_title.id, in_text.id], (
+        "Убедитесь, что поиск находит публикации по словам заголовка и"
+        " текста без учёта регистра, а совпадения в заголовке выводятся"
+        " первыми."
+    )
+    assert found(user_client, "ежик туман") == [in_text.id], (
+        "Убедитесь, что поиск находит публикации, содержащие все слова"
+        " запроса."
+    )
+    assert found(user_client, '"ежик*:') == [in_title.id, in_text.id], (
+        "Убедитесь, что синтаксис FTS5 в запросе экранируется."
+    )
+    assert found(user_client, "  ") == []
+
+
+def test_search_respects_visibility(
+        user_client, another_user_client, mixer, make_post
+):
+    visible = make_post("Видимый пост")
+    make_post("Видимый снятый пост", is_published=False)
+    hidden_category = mixer.blend("blog.Category", is_published=False)
+    make_post("Видимый пост в снятой категории", category=hidden_category)
+    make_post(
+        "Видимый отложенный пост",
+        pub_date=timezone.now() + timezone.timedelta(days=1),
+    )
+    for client in (user_client, another_user_client):
+        assert found(client, "видимый") == [visible.id], (
+            "Убедитесь, что поиск выводит только опубликованные публикации"
+            " из опубликованных категорий, время которых наступило."
+        )
+
+
+def test_index_follows_changes(user_client, make_post):
+    post = make_post("Старый заголовок")
+    post.title = "Новый заголовок"
+    post.save()
+    assert found(user_client, "старый") == []
+    assert found(user_client, "новый") == [post.id], (
+        "Убедитесь, что поисковый индекс обновляется при изменении"
+        " публикации."
+    )
+    post.delete()
+    assert found(user_client, "новый") == [], (
+        "Убедитесь, что удалённая публикация удаляется из поискового индекса."
+    )
+
+
+def test_search_pagination_keeps_query(client, mixer, make_post):
+    posts = [
+        make_post(f"Заметка {number}")
+        for number in range(PAGINATOR_SEARCH + 1)
+    ]
+    make_post("Посторонняя запись")
+    assert len(found(client, "заметка")) == PAGINATOR_SEARCH
+    content = client.get("/search/", {"q": "заметка"}).content.decode()
+    assert "?q=%D0%B7%D0%B0%D0%BC%D0%B5%D1%82%D0%BA%D0%B0&amp;page=2" in (
+        content
+    ), "Убедитесь, что ссылки пагинатора поиска сохраняют запрос."
+    assert len(found(client, "заметка", page=2)) == len(posts) - (
+        PAGINATOR_SEARCH
+    )
+
+
+@override_settings(SEARCH_BACKEND="blog.search.LikeSearchBackend")
+def test_like_backend(user_client, make_post):
+    post = make_post("Django tips", "About search")
+    make_post("Other")
+    assert found(user_client, "DJANGO search") == [post.id], (
+        "Убедитесь, что поиск без индекса находит публикации через icontains."
+    )
+
+
+def test_rebuild_search_index(user_client, make_post):
+    post = make_post("Заголовок")
+    type(post).objects.filter(pk=post.pk).update(title="Переписанный")
+    assert found(user_client, "переписанный") == []
+    call_command("rebuild_search_index", stdout=open("/dev/null", "w"))
+    assert found(user_client, "переписанный") == [post.id], (
+        "Убедитесь, что команда rebuild_search_index заполняет индекс"
+        " заново."
+    )
+
+
+def test_admin_uses_search_index(admin_client, make_post):
+    post = make_post("Заголовок", "Искомое слово в тексте")
+    response = admin_client.get("/admin/blog/post/", {"q": "искомое"})
+    assert list(response.context["cl"].result_list) == [post], (
+        "Убедитесь, что поиск в админке публикаций использует индекс."
+    )
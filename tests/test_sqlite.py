@@ -0,0 +1,100 @@
+import threading
+
+import pytest
+from django.db import OperationalError, connection
+from django.test import Client
+
+from blog import db
+from blog.models import Comment, Post
+
+N_WRITERS = 4
+N_COMMENTS = 10
+
+
+def pragma(name):
+    with connection.cursor() as cursor:
+        cursor.execute(f"PRAGMA {name}")
+        return cursor.fetchone()[0]
+
+
+@pytest.mark.django_db
+def test_connection_pragmas():
+    assert pragma("journal_mode") == "wal", (
+        "Убедитесь, что новые соединения с SQLite включают журнал WAL."
+    )
+    assert pragma("busy_timeout") == 5000
+    assert pragma("synchronous") == 1
+    assert pragma("cache_size") == -64000
+
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    delays = []
+    monkeypatch.setattr(db.time, "sleep", delays.append)
+    return delays
+
+
+def flaky(errors):
+    errors = list(errors)
+
+    def func():
+        if errors:
+            raise errors.pop(0)
+        return "ok"
+    return func
+
+
+@pytest.mark.django_db
+def test_retry_on_locked(settings, no_sleep):
+    settings.DB_LOCKED_RETRIES = 3
+    settings.DB_LOCKED_RETRY_DELAY = 0.1
+    locked = OperationalError("database is locked")
+    assert db.retry_on_locked(flaky([locked, locked])) == "ok", (
+        "Убедитесь, что запись повторяется при блокировке БД."
+    )
+    assert len(no_sleep) == 2
+    assert 0.1 <= no_sleep[0] <= 0.2 and 0.2 <= no_sleep[1] <= 0.4, (
+        "Убедитесь, что пауза между повторами растёт экспоненциально."
+    )
+    with pytest.raises(OperationalError):
+        db.retry_on_locked(flaky([locked] * 4))
+    with pytest.raises(OperationalError):
+        db.retry_on_locked(flaky([OperationalError("no such table: x")]))
+    assert len(no_sleep) == 5
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_comment_writers(user, make_post):
+    post = make_post()
+    clients = []
+    for _ in range(N_WRITERS):
+        client = Client()
+        client.force_login(user)
+        clients.append(client)
+    barrier = threading.Barrier(N_WRITERS)
+    statuses = []
+
+    def write(client):
+        barrier.wait()
+        try:
+            for number in range(N_COMMENTS):
+                statuses.append(client.post(
+                    f"/posts/{post.id}/comment/",
+                    {"text": f"Комментарий {number}"},
+                ).status_code)
+        finally:
+            connection.close()
+
+    threads = [
+        threading.Thread(target=write, args=(client,)) for client in clients
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert statuses == [302] * N_WRITERS * N_COMMENTS, (
+        "Убедитесь, что одновременные комментарии сохраняются без ошибок"
+        " блокировки БД."
+    )
+    assert Comment.objects.filter(post=post).count() == len(statuses)
+    assert Post.objects.get(pk=post.pk).comment_count == len(statuses)
@@ -0,0 +1,111 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.models import Post
+from blog.views import filtered_post
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def posts(make_post):
+    return [
+        make_post(pub_date=timezone.now() - timezone.timedelta(days=1))
+        for _ in range(3)
+    ]
+
+
+@pytest.fixture
+def scheduled_post(make_post):
+    return make_post(pub_date=timezone.now() + timezone.timedelta(days=1))
+
+
+def visible_ids():
+    return set(
+        Post.objects.filter(is_visible=True).values_list("id", flat=True)
+    )
+
+
+def post_updates(context):
+    return [
+        query["sql"] for query in context.captured_queries
+        if query["sql"].startswith('UPDATE "blog_post"')
+    ]
+
+
+def test_feed_query_does_not_join_category_for_filter():
+    sql = str(filtered_post(Post.objects.all(), False).query)
+    assert "blog_category" not in sql, (
+        "Убедитесь, что фильтр видимости публикаций не соединяет запрос"
+        " с таблицей категорий."
+    )
+
+
+def test_post_save_sets_visibility(mixer, user, posts, scheduled_post):
+    hidden_category = mixer.blend("blog.Category", is_published=False)
+    hidden = mixer.blend(
+        "blog.Post", is_published=True, author=user, category=hidden_category,
+        pub_date=timezone.now() - timezone.timedelta(days=1),
+    )
+    unpublished = mixer.blend(
+        "blog.Post", is_published=False, author=user,
+        category=posts[0].category,
+        pub_date=timezone.now() - timezone.timedelta(days=1),
+    )
+    assert visible_ids() == {post.id for post in posts}, (
+        "Убедитесь, что видимыми отмечаются только опубликованные"
+        " публикации из опубликованных категорий, время которых наступило."
+    )
+    unpublished.is_published = True
+    unpublished.save()
+    hidden.category = posts[0].category
+    hidden.save()
+    assert {unpublished.id, hidden.id} <= visible_ids()
+
+
+def test_category_flip_is_single_update(
+        published_category, posts, scheduled_post
+):
+    published_category.is_published = False
+    with CaptureQueriesContext(connection) as context:
+        published_category.save()
+    assert len(post_updates(context)) == 1, (
+        "Убедитесь, что видимость публикаций категории пересчитывается"
+        " одним запросом UPDATE."
+    )
+    assert visible_ids() == set()
+    published_category.is_published = True
+    published_category.save()
+    assert visible_ids() == {post.id for post in posts}, (
+        "Убедитесь, что после публикации категории видны её опубликованные"
+        " публикации, время которых наступило, а отложенные — нет."
+    )
+
+
+def test_category_delete_hides_posts(published_category, posts):
+    published_category.delete()
+    assert visible_ids() == set(), (
+        "Убедитесь, что публикации удалённой категории скрываются."
+    )
+
+
+@pytest.mark.parametrize("action", ["unpublish", "publish"])
+def test_admin_category_actions(
+        admin_client, published_category, posts, scheduled_post, action
+):
+    if action == "publish":
+        type(published_category).objects.update(is_published=False)
+        Post.objects.update(is_visible=False)
+    with CaptureQueriesContext(connection) as context:
+        admin_client.post(
+            "/admin/blog/category/",
+            {"action": action, "_selected_action": [published_category.id]},
+        )
+    assert len(post_updates(context)) == 1
+    expected = {post.id for post in posts} if action == "publish" else set()
+    assert visible_ids() == expected, (
+        "Убедитесь, что действия админки над категориями пересчитывают"
+        " видимость их публикаций."
+    )
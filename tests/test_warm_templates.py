@@ -0,0 +1,21 @@
+from django.core.management import call_command
+from django.template import engines
+from django.test import override_settings
+
+from blogicum.settings_production import TEMPLATES
+
+
+@override_settings(TEMPLATES=TEMPLATES)
+def test_warm_templates_fills_cached_loader(capsys):
+    call_command("warm_templates")
+    loader, = engines["django"].engine.template_loaders
+    assert loader.get_template_cache, (
+        "Убедитесь, что команда warm_templates заранее компилирует шаблоны"
+        " в cached loader."
+    )
+    assert "Скомпилировано шаблонов" in capsys.readouterr().out
+
+
+def test_warm_templates_is_quiet(capsys):
+    call_command("warm_templates", verbosity=0)
+    assert capsys.readouterr().out == ""